@@ -0,0 +1,74 @@
+"""add_transaction_retry_count
+
+Revision ID: 3c8e51a0d2f4
+Revises: 95267174a74f
+Create Date: 2026-10-16 09:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e51a0d2f4'
+down_revision: Union[str, Sequence[str], None] = '95267174a74f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Before this column, retries were counted in a "__RETRY:N" memo suffix
+_LEGACY_RETRY_MARKER = '__RETRY:'
+
+_transactions = sa.table(
+    'transactions',
+    sa.column('id', sa.Integer),
+    sa.column('memo', sa.Text),
+    sa.column('retry_count', sa.SmallInteger),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'transactions',
+        sa.Column('retry_count', sa.SmallInteger(), server_default='0', nullable=False),
+    )
+    op.create_index('ix_transactions_processed_retry', 'transactions', ['processed', 'retry_count'], unique=False)
+
+    # Move legacy memo retry counters into the column and restore the memo
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(_transactions.c.id, _transactions.c.memo).where(
+            _transactions.c.memo.contains(_LEGACY_RETRY_MARKER, autoescape=True)
+        )
+    ).all()
+    for row_id, memo in rows:
+        parts = memo.split(_LEGACY_RETRY_MARKER)
+        try:
+            retry_count = int(parts[-1])
+        except ValueError:
+            retry_count = 0
+        conn.execute(
+            _transactions.update()
+            .where(_transactions.c.id == row_id)
+            .values(memo=parts[0], retry_count=retry_count)
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Put the retry counters back into the memo suffix
+    conn = op.get_bind()
+    conn.execute(
+        _transactions.update()
+        .where(_transactions.c.retry_count > 0)
+        .values(
+            memo=sa.func.coalesce(_transactions.c.memo, '')
+            + _LEGACY_RETRY_MARKER
+            + sa.cast(_transactions.c.retry_count, sa.String)
+        )
+    )
+    op.drop_index('ix_transactions_processed_retry', table_name='transactions')
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.drop_column('retry_count')
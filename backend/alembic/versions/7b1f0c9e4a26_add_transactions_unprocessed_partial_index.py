@@ -0,0 +1,43 @@
+"""add_transactions_unprocessed_partial_index
+
+Revision ID: 7b1f0c9e4a26
+Revises: 3c8e51a0d2f4
+Create Date: 2026-10-16 10:03:17.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b1f0c9e4a26'
+down_revision: Union[str, Sequence[str], None] = '3c8e51a0d2f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction (Postgres); ignored on SQLite
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transactions_unprocessed',
+            'transactions',
+            ['id'],
+            unique=False,
+            sqlite_where=sa.text('processed = 0'),
+            postgresql_where=sa.text('processed = false'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_transactions_unprocessed',
+            table_name='transactions',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,41 @@
+"""add_transak_orders_fan_created_index
+
+Revision ID: a83d5f2c6b17
+Revises: e5a2c7f81b09
+Create Date: 2026-10-16 22:48:31.207645
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a83d5f2c6b17'
+down_revision: Union[str, Sequence[str], None] = 'e5a2c7f81b09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction (Postgres); ignored on SQLite
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transak_orders_fan_created',
+            'transak_orders',
+            ['fan_wallet', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_transak_orders_fan_created',
+            table_name='transak_orders',
+            postgresql_concurrently=True,
+        )
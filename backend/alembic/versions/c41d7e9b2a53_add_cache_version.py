@@ -0,0 +1,32 @@
+"""add_cache_version
+
+Revision ID: c41d7e9b2a53
+Revises: 7b1f0c9e4a26
+Create Date: 2026-10-16 11:26:04.873315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e9b2a53'
+down_revision: Union[str, Sequence[str], None] = '7b1f0c9e4a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('cache_version',
+    sa.Column('key', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('cache_version')
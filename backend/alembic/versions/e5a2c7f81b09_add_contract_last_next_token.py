@@ -0,0 +1,29 @@
+"""add_contract_last_next_token
+
+Revision ID: e5a2c7f81b09
+Revises: c41d7e9b2a53
+Create Date: 2026-10-16 12:41:55.302716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a2c7f81b09'
+down_revision: Union[str, Sequence[str], None] = 'c41d7e9b2a53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contracts', sa.Column('last_next_token', sa.String(length=128), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('contracts') as batch_op:
+        batch_op.drop_column('last_next_token')
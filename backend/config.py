@@ -47,6 +47,10 @@ class Settings(BaseSettings):
 
     # ── Listener ────────────────────────────────────────────────────
     listener_poll_seconds: int = 10
+    max_inflight_mints: int = 200        # mint queue bound; listener pauses ingest above it
+    mint_worker_count: int = 4           # concurrent mint pipelines (match algod thread pool)
+    listener_round_persist_interval: int = 100   # persist last round after this many rounds...
+    listener_round_persist_seconds: float = 30.0  # ...or after this long, whichever comes first
 
     # ── Contract ────────────────────────────────────────────────────
     tip_proxy_contract_path: str = "contracts/tip_proxy/compiled"
@@ -45,10 +45,14 @@ async_session = async_sessionmaker(
 async def init_db() -> None:
     """Create all tables. Called once on server startup."""
     # Import models so Base.metadata knows about them
-    import db_models  # noqa: F401
+    import db_models
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all skips indexes on tables that already exist, so indexes
+        # added after a table first shipped are created here (IF NOT EXISTS)
+        for index in db_models.LATE_INDEXES:
+            await conn.run_sync(index.create, checkfirst=True)
 
     logger.info("Database tables created (or already exist)")
 
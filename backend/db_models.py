@@ -16,8 +16,8 @@ Tables:
 from datetime import datetime
 
 from sqlalchemy import (
-    Column, Integer, BigInteger, String, Float, Boolean, DateTime, Text, ForeignKey,
-    UniqueConstraint, Index,
+    Column, Integer, SmallInteger, BigInteger, String, Float, Boolean, DateTime, Text, JSON, ForeignKey,
+    UniqueConstraint, Index, and_, false,
 )
 from sqlalchemy.orm import relationship
 
@@ -53,6 +53,7 @@ class Contract(Base):
     app_address = Column(String(58), nullable=False)
     version = Column(Integer, nullable=False, default=1)
     active = Column(Boolean, nullable=False, default=True)
+    last_next_token = Column(String(128), nullable=True)  # Indexer pagination resume point (listener)
     deployed_at = Column(DateTime, default=datetime.utcnow)
     upgraded_at = Column(DateTime, nullable=True)
 
@@ -123,6 +124,7 @@ class Transaction(Base):
     amount_micro = Column(BigInteger, nullable=False)  # microAlgos (1 ALGO = 1_000_000)
     memo = Column(Text, nullable=True)
     processed = Column(Boolean, nullable=False, default=False)  # has minting pipeline run?
+    retry_count = Column(SmallInteger, nullable=False, default=0, server_default="0")  # failed mint retries
     detected_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     # Relationships
@@ -136,6 +138,16 @@ class Transaction(Base):
         Index("ix_transactions_fan_detected", "fan_wallet", "detected_at"),
         # For processed status queries (listener retry task)
         Index("ix_transactions_processed_detected", "processed", "detected_at"),
+        # Dead-letter scan: processed=False AND retry_count < MAX_RETRY_ATTEMPTS
+        Index("ix_transactions_processed_retry", "processed", "retry_count"),
+        # Partial index: only the (tiny) dead-letter set, so the retry scan
+        # stays an index seek no matter how large the table grows
+        Index(
+            "ix_transactions_unprocessed",
+            "id",
+            sqlite_where=processed == false(),
+            postgresql_where=processed == false(),
+        ),
     )
 
 
@@ -152,7 +164,7 @@ class SubmittedTransaction(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     idempotency_key = Column(String(128), nullable=False, unique=True, index=True)
     tx_id = Column(String(64), nullable=False, index=True)
-    request_hash = Column(String(64), nullable=True)  # sha256 hex of request payload
+    request_hash = Column(String(64), nullable=True)  # blake2b-128 hex of request payload
     kind = Column(String(20), nullable=False, default="single")  # "single" | "group"
     status = Column(String(20), nullable=False, default="submitted")  # submitted | failed
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -280,6 +292,14 @@ class ShawtyToken(Base):
     __table_args__ = (
         # Ensure each purchase transaction only registers a single Shawty token
         UniqueConstraint("purchase_tx_id", name="uq_shawty_purchase_tx_id"),
+        # Partial index: a fan's redeemable tokens (get_fan_shawty_tokens
+        # default path) without walking their burned/locked history
+        Index(
+            "ix_shawty_active_owner",
+            "owner_wallet",
+            sqlite_where=and_(is_burned == false(), is_locked == false()),
+            postgresql_where=and_(is_burned == false(), is_locked == false()),
+        ),
     )
 
 
@@ -349,7 +369,7 @@ class Order(Base):
     subtotal_algo = Column(Float, nullable=False, default=0.0)
     discount_algo = Column(Float, nullable=False, default=0.0)
     total_algo = Column(Float, nullable=False, default=0.0)
-    shawty_asset_ids_used = Column(Text, nullable=True)  # JSON list of asset IDs
+    shawty_asset_ids_used = Column(JSON, nullable=True)  # list of asset IDs (driver-serialized)
     tx_id = Column(String(64), nullable=True, index=True)  # payment tx id detected by listener
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     paid_at = Column(DateTime, nullable=True)
@@ -450,6 +470,11 @@ class TransakOrder(Base):
     completed_at = Column(DateTime, nullable=True)   # When Transak conversion finished
     tip_sent_at = Column(DateTime, nullable=True)     # When we routed the tip on-chain
 
+    __table_args__ = (
+        # Fan order history: filter by fan_wallet, newest first
+        Index("ix_transak_orders_fan_created", "fan_wallet", "created_at"),
+    )
+
 
 class ListenerState(Base):
     """
@@ -464,3 +489,27 @@ class ListenerState(Base):
     id = Column(Integer, primary_key=True, default=1)
     last_processed_round = Column(BigInteger, nullable=False, default=0)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class CacheVersion(Base):
+    """
+    Version counters for in-process config caches.
+
+    The listener caches active contracts and sticker templates between
+    poll cycles. Endpoints that change them bump the matching key here;
+    the listener compares one primary-key lookup against its cached
+    version instead of re-querying the data every cycle.
+    """
+    __tablename__ = "cache_version"
+
+    key = Column(String(50), primary_key=True)  # "contracts" | "templates"
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+# Indexes added after their table first shipped. init_db's create_all
+# only builds indexes with new tables, so it creates these IF NOT EXISTS
+# on existing databases too.
+LATE_INDEXES = [
+    index for index in ShawtyToken.__table__.indexes
+    if index.name == "ix_shawty_active_owner"
+]
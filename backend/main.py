@@ -41,7 +41,13 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Database initialized")
 
-    # Start the transaction listener (Phase 4)
+    # Start the mint workers + transaction listener (Phase 4)
+    try:
+        from services import mint_worker
+        await mint_worker.start()
+    except Exception as e:
+        logger.warning(f"Mint workers failed to start (non-fatal): {e}")
+
     try:
         from services import listener_service
         await listener_service.start()
@@ -58,6 +64,12 @@ async def lifespan(app: FastAPI):
     except Exception:
         pass
 
+    try:
+        from services import mint_worker
+        await mint_worker.stop()
+    except Exception:
+        pass
+
     # Phase 7: Shutdown thread pool executor for blocking Algorand calls
     try:
         from services.async_executor import shutdown_executor
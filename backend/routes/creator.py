@@ -34,7 +34,7 @@ from models import (
     StickerTemplateResponse,
     StickerTemplateListResponse,
 )
-from services import contract_service, ipfs_service
+from services import cache_version, contract_service, ipfs_service, transak_service
 from utils.validators import validate_algorand_address
 
 logger = logging.getLogger(__name__)
@@ -134,6 +134,7 @@ async def register_creator(
         active=True,
     )
     db.add(contract)
+    await cache_version.bump(db, cache_version.CONTRACTS)
     await db.commit()
 
     logger.info(
@@ -282,7 +283,9 @@ async def upgrade_creator_contract(
         active=True,
     )
     db.add(new_contract)
+    await cache_version.bump(db, cache_version.CONTRACTS)
     await db.commit()
+    transak_service.invalidate_tip_proxy(wallet)
 
     # Close out old contract (best-effort, don't fail if this errors)
     contract_service.close_out_contract(old_contract.app_id, wallet)
@@ -593,6 +596,7 @@ async def create_sticker_template(
         tip_threshold=tip_threshold,
     )
     db.add(template)
+    await cache_version.bump(db, cache_version.TEMPLATES)
     await db.commit()
     await db.refresh(template)
 
@@ -714,6 +718,7 @@ async def delete_sticker_template(
         await ipfs_service.unpin(template.ipfs_hash)
 
     await db.delete(template)
+    await cache_version.bump(db, cache_version.TEMPLATES)
     await db.commit()
 
     logger.info(f"  Template '{template.name}' deleted for {wallet[:8]}...")
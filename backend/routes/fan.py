@@ -202,7 +202,7 @@ async def claim_pending_nft(
 
     # Attempt delivery (no fan_private_key — fan must have opted in via Pera)
     try:
-        delivery = nft_service.send_nft_to_fan(
+        delivery = await nft_service.send_nft_to_fan_async(
             asset_id=nft.asset_id,
             fan_wallet=wallet,
         )
@@ -220,6 +220,7 @@ async def create_discount_rule(
         max_uses_per_wallet=request.max_uses_per_wallet,
     )
     await db.commit()
+    merch_service.invalidate_discount_rules(wallet)
     await db.refresh(rule)
     return success_response(
         data={
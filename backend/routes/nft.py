@@ -63,7 +63,7 @@ async def mint_soulbound_nft(
 
     # Mint NFT on-chain
     try:
-        asset_id = nft_service.mint_soulbound_sticker(
+        asset_id = await nft_service.mint_soulbound_sticker_async(
             name=template.name[:32],  # ASA name max 32 chars
             metadata_url=template.metadata_url or template.image_url or "",
             unit_name="STICKER",
@@ -80,7 +80,7 @@ async def mint_soulbound_nft(
     # Transfer to fan
     tx_id = None
     try:
-        tx_id = nft_service.send_nft_to_fan(
+        tx_id = await nft_service.send_nft_to_fan_async(
             asset_id=asset_id,
             fan_wallet=fan_wallet,
         )
@@ -143,7 +143,7 @@ async def mint_golden_nft(
 
     # Mint NFT on-chain
     try:
-        asset_id = nft_service.mint_golden_sticker(
+        asset_id = await nft_service.mint_golden_sticker_async(
             name=template.name[:32],
             metadata_url=template.metadata_url or template.image_url or "",
             unit_name="GOLDEN",
@@ -160,7 +160,7 @@ async def mint_golden_nft(
     # Transfer to fan
     tx_id = None
     try:
-        tx_id = nft_service.send_nft_to_fan(
+        tx_id = await nft_service.send_nft_to_fan_async(
             asset_id=asset_id,
             fan_wallet=fan_wallet,
         )
@@ -234,7 +234,7 @@ async def transfer_nft(
 
     # Transfer on-chain
     try:
-        tx_id = nft_service.send_nft_to_fan(
+        tx_id = await nft_service.send_nft_to_fan_async(
             asset_id=asset_id,
             fan_wallet=receiver_wallet,
         )
@@ -22,7 +22,9 @@ Endpoints:
 """
 import logging
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -35,7 +37,7 @@ from utils.validators import validate_algorand_address
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/onramp", tags=["on-ramp"])
+router = APIRouter(prefix="/onramp", tags=["on-ramp"], default_response_class=ORJSONResponse)
 
 # Separate router for simulation (no /onramp prefix)
 sim_router = APIRouter(prefix="/simulate", tags=["simulation"])
@@ -154,8 +156,8 @@ async def transak_webhook(
         raise HTTPException(status_code=401, detail="Invalid webhook signature")
 
     try:
-        data = await request.json()
-    except Exception:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON payload")
 
     webhook_data = data.get("data", data)
@@ -241,7 +243,7 @@ async def simulate_fund_wallet(
         private_key = settings.platform_private_key
         amount_micro = int(amount * 1_000_000)
 
-        tx_id = payment_service.send_payment(
+        tx_id = await payment_service.send_payment_async(
             sender_address=settings.platform_wallet,
             sender_private_key=private_key,
             receiver_address=wallet,
@@ -11,11 +11,14 @@ import logging
 from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable, TypeVar
 
+from config import settings
+
 logger = logging.getLogger(__name__)
 
 # Shared executor for blocking operations; sized for concurrent mints
+# (one algod thread per mint worker, never fewer than 4)
 _executor: ThreadPoolExecutor | None = None
-_MAX_WORKERS = 4
+_MAX_WORKERS = max(4, settings.mint_worker_count)
 
 
 def get_executor() -> ThreadPoolExecutor:
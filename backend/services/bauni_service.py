@@ -36,6 +36,7 @@ async def purchase_membership(
     asset_id: int,
     purchase_tx_id: Optional[str] = None,
     amount_paid_micro: int = BAUNI_COST_MICRO,
+    now: Optional[datetime] = None,
 ) -> dict:
     """
     Record a Bauni membership purchase.
@@ -52,6 +53,7 @@ async def purchase_membership(
         asset_id: Minted Bauni ASA ID
         purchase_tx_id: Algorand TX ID of the purchase
         amount_paid_micro: Amount paid in microAlgos
+        now: Caller's clock reading (naive UTC); defaults to utcnow()
 
     Returns:
         dict: {membership, is_renewal, expires_at}
@@ -59,7 +61,7 @@ async def purchase_membership(
     from db_models import Membership
 
     # Check for existing active membership
-    now = datetime.utcnow()
+    now = now or datetime.utcnow()
     result = await db.execute(
         select(Membership).where(
             Membership.fan_wallet == fan_wallet,
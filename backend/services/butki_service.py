@@ -31,6 +31,7 @@ async def record_tip(
     creator_wallet: str,
     tx_id: str,
     amount_micro: int,
+    now: Optional[datetime] = None,
 ) -> dict:
     """
     Record a qualifying tip and check if a new Butki badge is earned.
@@ -40,6 +41,7 @@ async def record_tip(
         fan_wallet: Fan's Algorand address
         creator_wallet: Creator's Algorand address
         amount_micro: Tip amount in microAlgos
+        now: Caller's clock reading (naive UTC); defaults to utcnow()
 
     Returns:
         dict: {
@@ -99,7 +101,7 @@ async def record_tip(
         .on_conflict_do_nothing(index_elements=["fan_wallet", "creator_wallet"])
     )
 
-    now = datetime.utcnow()
+    now = now or datetime.utcnow()
 
     # Atomic increment to avoid races:
     # - tip_count += 1
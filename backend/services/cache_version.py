@@ -0,0 +1,47 @@
+"""
+Cache Version Service — invalidation counters for in-process config caches.
+
+Writers call bump() in the same transaction that changes the cached data,
+so the new version becomes visible exactly when the change commits.
+Readers call get_versions() once and reload only the caches whose
+version moved.
+"""
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+logger = logging.getLogger(__name__)
+
+# Cache keys
+CONTRACTS = "contracts"   # active TipProxy contracts (Contract.active)
+TEMPLATES = "templates"   # sticker templates (StickerTemplate)
+
+
+async def get_versions(db: AsyncSession) -> dict[str, int]:
+    """
+    Get all cache versions in one query.
+
+    Keys that were never bumped are absent; treat them as version 0.
+    """
+    from db_models import CacheVersion
+
+    result = await db.execute(select(CacheVersion.key, CacheVersion.version))
+    return {key: version for key, version in result.all()}
+
+
+async def bump(db: AsyncSession, key: str) -> None:
+    """
+    Increment a cache version (caller commits).
+
+    Atomic upsert, so concurrent writers never lose a bump.
+    """
+    from db_models import CacheVersion
+
+    stmt = sqlite_insert(CacheVersion).values(key=key, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={"version": CacheVersion.version + 1},
+    )
+    await db.execute(stmt)
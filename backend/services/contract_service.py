@@ -12,6 +12,9 @@ import logging
 import os
 import time
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
 
 from algosdk import transaction, encoding, logic, account
 
@@ -244,19 +247,21 @@ def create_tipproxy_action_txn(*, sender: str, app_id: int, action: str) -> dict
 # ════════════════════════════════════════════════════════════════════
 
 
-def _get_platform_account() -> dict:
+@lru_cache(maxsize=1)
+def _get_platform_account() -> Mapping[str, str]:
     """
     Get the platform wallet's private key and address.
 
     Security fix H4: Uses settings.platform_private_key (cached)
-    instead of re-deriving from mnemonic on every call.
+    instead of re-deriving from mnemonic on every call. The address is
+    derived once per process too (read-only mapping, shared by callers).
 
     Returns:
-        dict with 'address' and 'private_key'
+        mapping with 'address' and 'private_key'
     """
     private_key = settings.platform_private_key  # Cached in config.py
     address = account.address_from_private_key(private_key)
-    return {"address": address, "private_key": private_key}
+    return MappingProxyType({"address": address, "private_key": private_key})
 
 
 def deploy_tip_proxy(creator_wallet: str, min_tip_algo: float = 1.0) -> dict:
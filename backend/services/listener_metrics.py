@@ -21,6 +21,7 @@ class ListenerMetrics:
     indexer_query_errors: int = 0
     last_processed_round: int = 0
     current_round: int | None = None  # From algod status, updated periodically
+    mints_in_flight: int = 0  # mint+send pipelines holding an algod slot right now
     last_heartbeat: float = field(default_factory=time.monotonic)
     # Rolling window: tips in last 60 seconds
     _tips_minute_window: list[float] = field(default_factory=list)
@@ -35,6 +36,12 @@ class ListenerMetrics:
     def record_mint_failed(self) -> None:
         self.failed_mints_count += 1
 
+    def mint_started(self) -> None:
+        self.mints_in_flight += 1
+
+    def mint_finished(self) -> None:
+        self.mints_in_flight -= 1
+
     def record_retry_success(self) -> None:
         self.retry_success_count += 1
 
@@ -75,6 +82,7 @@ class ListenerMetrics:
             "retry_success_count": self.retry_success_count,
             "retry_fail_count": self.retry_fail_count,
             "indexer_query_errors": self.indexer_query_errors,
+            "mints_in_flight": self.mints_in_flight,
             "last_processed_round": self.last_processed_round,
             "current_round": self.current_round,
             "listener_lag_rounds": lag,
@@ -5,8 +5,8 @@ V4 Architecture:
     - Queries Indexer for ApplicationCall txns to all active TipProxy app_ids
     - Parses the structured binary log emitted by TipProxy.tip()
     - Records transactions in the DB
-    - Routes tips through the minting pipeline (soulbound/golden/membership)
-    - Marks transactions as processed
+    - Enqueues new tips for the mint workers (services/mint_worker), which
+      route them through the minting pipeline and mark them processed
 
 Log format (from TipProxy.tip()):
     fan_address (32 bytes) + amount (8 bytes uint64 big-endian) + memo (remaining)
@@ -20,28 +20,42 @@ Fixes applied:
     #4:  Background retry task for failed mints (dead-letter recovery)
 """
 import asyncio
-import base64
 import json
 import logging
 import os
+import re
+import struct
+import time
 
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import NamedTuple, Optional
 
 import httpx
+import orjson
+import pybase64
 from algosdk import encoding as algo_encoding, mnemonic as algo_mnemonic
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from config import settings
 from database import async_session
+from db_models import (
+    Contract, ListenerState, Membership, NFT, ShawtyToken, StickerTemplate, Transaction,
+)
+from domain.constants import MEMO_ORDER_PREFIX, MEMO_BAUNI_PREFIX, MEMO_SHAWTY_PREFIX
+from services import (
+    bauni_service, butki_service, cache_version, merch_service, mint_worker, nft_service,
+    shawty_service,
+)
 from services.listener_metrics import get_listener_metrics
 
 logger = logging.getLogger(__name__)
 
 # Phase 7: Remaining TODOs (optional enhancements):
-# 1. Migrate minting from synchronous (blocks event loop ~4.5s/mint) to task queue:
-#    - Option A: Celery + Redis broker (mature, well-documented)
-#    - Option B: ARQ (async-native, lighter weight, better for this project)
-#    - Listener enqueues mint tasks → workers process independently
+# 1. DONE: minting runs in services/mint_worker (listener only enqueues).
+#    Move the in-process queue to ARQ/Redis if mints must survive restarts
+#    without waiting for the retry task, or scale across processes.
 # 2. Add heartbeat mechanism — update timestamp every poll cycle
 #    - Health endpoint returns "unhealthy" if heartbeat stale (> 2x poll interval)
 #    - Auto-restart listener task on detected hang
@@ -54,7 +68,31 @@ logger = logging.getLogger(__name__)
 # Demo Mode — Fan Private Key Resolver
 # ════════════════════════════════════════════════════════════════════
 
-_demo_accounts_cache: Optional[dict] = None
+# {address: private_key}, built once from demo_accounts.json
+_demo_key_by_addr: Optional[dict[str, str]] = None
+
+
+def _load_demo_keys() -> dict[str, str]:
+    """Load demo_accounts.json and derive every account's private key once."""
+    path = settings.demo_accounts_file
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(os.path.dirname(__file__)), path)
+    try:
+        with open(path) as f:
+            accounts = json.load(f)
+        logger.info(f"  Demo accounts loaded from {path}")
+    except FileNotFoundError:
+        logger.warning(f"  Demo accounts file not found: {path}")
+        return {}
+
+    keys = {}
+    for label, acct in accounts.items():
+        if acct.get("address") and acct.get("mnemonic"):
+            try:
+                keys[acct["address"]] = algo_mnemonic.to_private_key(acct["mnemonic"])
+            except Exception:
+                logger.warning(f"  Demo account '{label}' has an invalid mnemonic, skipping")
+    return keys
 
 
 def _get_demo_fan_key(fan_wallet: str) -> Optional[str]:
@@ -67,34 +105,16 @@ def _get_demo_fan_key(fan_wallet: str) -> Optional[str]:
     Returns:
         Private key string, or None if not found / not in demo mode.
     """
-    global _demo_accounts_cache
+    global _demo_key_by_addr
 
     if not settings.demo_mode:
         return None
 
-    # Load + cache demo accounts on first call
-    if _demo_accounts_cache is None:
-        path = settings.demo_accounts_file
-        if not os.path.isabs(path):
-            path = os.path.join(os.path.dirname(os.path.dirname(__file__)), path)
-        try:
-            with open(path) as f:
-                _demo_accounts_cache = json.load(f)
-            logger.info(f"  Demo accounts loaded from {path}")
-        except FileNotFoundError:
-            logger.warning(f"  Demo accounts file not found: {path}")
-            _demo_accounts_cache = {}
-            return None
-
-    # Search all accounts for a matching wallet address
-    for label, acct in _demo_accounts_cache.items():
-        if acct.get("address") == fan_wallet and acct.get("mnemonic"):
-            try:
-                return algo_mnemonic.to_private_key(acct["mnemonic"])
-            except Exception:
-                return None
+    # Load + derive keys on first call; later calls are a dict lookup
+    if _demo_key_by_addr is None:
+        _demo_key_by_addr = _load_demo_keys()
 
-    return None
+    return _demo_key_by_addr.get(fan_wallet)
 
 # Listener state
 _listener_task: Optional[asyncio.Task] = None
@@ -102,11 +122,195 @@ _retry_task: Optional[asyncio.Task] = None
 _is_running: bool = False
 _errors_count: int = 0
 
+# Set by stop(): wakes both loops immediately so they exit between cycles
+# instead of being cancelled mid-transaction. Created per start().
+_stop_event: Optional[asyncio.Event] = None
+
+# How long stop() lets an in-flight cycle finish before cancelling it
+_STOP_GRACE_SECONDS = 10.0
+
+# Shortest wait between cycles after one that found tips (see _listener_loop)
+_MIN_POLL_SECONDS = 1.0
+
+
+async def _wait_for_stop(timeout: float) -> bool:
+    """Sleep up to `timeout` seconds; return True as soon as stop() is requested."""
+    try:
+        await asyncio.wait_for(_stop_event.wait(), timeout=timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+async def _wait_for_next_block(after_round: Optional[int], ceiling: float) -> tuple[bool, Optional[int]]:
+    """
+    Long-poll algod until a block after `after_round` lands, stop() is
+    requested, or `ceiling` seconds pass — whichever comes first.
+
+    Uses /v2/status/wait-for-block-after/{round}, so a new block starts the
+    next cycle immediately instead of after a fixed sleep. If algod can't be
+    reached, falls back to a plain `ceiling` sleep so the Indexer is never
+    polled in a tight loop.
+
+    Returns:
+        (stop_requested, algod last-round or None if unknown)
+    """
+    url = f"{settings.algorand_algod_address}/v2/status/wait-for-block-after/{after_round or 0}"
+    probe = asyncio.ensure_future(_get_http_client().get(url, timeout=ceiling + 5.0))
+    stop_wait = asyncio.ensure_future(_stop_event.wait())
+    try:
+        done, _ = await asyncio.wait(
+            (probe, stop_wait), timeout=ceiling, return_when=asyncio.FIRST_COMPLETED
+        )
+    finally:
+        for task in (probe, stop_wait):
+            if not task.done():
+                task.cancel()
+
+    if stop_wait in done:
+        return True, None
+    if probe not in done:
+        return False, None  # no new block within the ceiling; poll anyway
+
+    try:
+        r = probe.result()
+        r.raise_for_status()
+        return False, orjson.loads(r.content).get("last-round")
+    except Exception as e:
+        logger.debug(f"algod wait-for-block failed, falling back to fixed poll: {e}")
+        return await _wait_for_stop(ceiling), None
+
+
 # In-memory cache of last round (DB is source of truth)
 _last_processed_round: int = 0
 
-# Periodic membership expiry cleanup (Phase 3)
-_last_membership_expiry_cleanup: Optional[datetime] = None
+# Last round written to listener_state, and when. Writes are coalesced:
+# a restart re-reads at most one persist window of rounds, and tx_id
+# dedup makes the re-read harmless.
+_persisted_round: int = 0
+_last_persist_mono: float = 0.0
+
+# Periodic membership expiry cleanup (Phase 3), gated on the monotonic
+# clock so wall-clock adjustments can't skip or repeat a sweep
+_MEMBERSHIP_EXPIRY_INTERVAL_SECONDS = 300
+_last_cleanup_mono: Optional[float] = None
+
+
+# ════════════════════════════════════════════════════════════════════
+# Config Caches — active contracts + sticker templates
+# ════════════════════════════════════════════════════════════════════
+# Contracts and templates change on a minutes-to-hours scale, but were
+# re-queried every poll cycle / every tip. They are cached in-process as
+# plain snapshots (safe to use after their session closes) and reloaded
+# only when the matching cache_version row has been bumped.
+
+
+class _ContractRef(NamedTuple):
+    app_id: int
+    creator_wallet: str
+
+
+class _TemplateRef(NamedTuple):
+    id: int
+    name: str
+    metadata_url: Optional[str]
+
+
+# (version, active contracts)
+_contract_cache: tuple[int, list[_ContractRef]] = (-1, [])
+
+# (creator_wallet, category) -> template (None = creator has no such template)
+_template_cache: dict[tuple[str, str], Optional[_TemplateRef]] = {}
+_template_cache_version: int = -1
+
+# Template categories route_tip mints from (preloaded per creator)
+_ROUTED_TEMPLATE_CATEGORIES = ("bauni_membership", "shawty_collectible", "butki_badge")
+
+# app_id -> Indexer next-token to resume from (Contract.last_next_token).
+# Kept in step with the DB column; reloaded with the contract cache.
+_next_tokens: dict[int, str] = {}
+
+
+async def _get_active_contracts(db, versions: dict[str, int]) -> list[_ContractRef]:
+    """Return active contracts, re-querying only if the contracts version moved."""
+    global _contract_cache
+
+    version = versions.get(cache_version.CONTRACTS, 0)
+    if _contract_cache[0] != version:
+        result = await db.execute(
+            select(Contract.app_id, Contract.creator_wallet, Contract.last_next_token).where(
+                Contract.active == True
+            )
+        )
+        rows = result.all()
+        _contract_cache = (version, [_ContractRef(app_id, creator) for app_id, creator, _ in rows])
+        _next_tokens.clear()
+        _next_tokens.update({app_id: token for app_id, _, token in rows if token})
+    return _contract_cache[1]
+
+
+def _sync_template_cache(versions: dict[str, int]) -> None:
+    """Drop cached templates if the templates version moved."""
+    global _template_cache_version
+    version = versions.get(cache_version.TEMPLATES, 0)
+    if _template_cache_version != version:
+        _template_cache.clear()
+        _template_cache_version = version
+
+
+async def _preload_templates(db, creator_wallets: set[str]) -> None:
+    """
+    Warm the template cache for creators about to be minted for.
+
+    One IN query covers every uncached creator in the batch, so mint
+    workers hit the cache instead of issuing up to three SELECTs per tip.
+    """
+    missing = {
+        wallet for wallet in creator_wallets
+        if any((wallet, category) not in _template_cache for category in _ROUTED_TEMPLATE_CATEGORIES)
+    }
+    if not missing:
+        return
+
+    result = await db.execute(
+        select(
+            StickerTemplate.creator_wallet,
+            StickerTemplate.category,
+            StickerTemplate.id,
+            StickerTemplate.name,
+            StickerTemplate.metadata_url,
+        )
+        .where(
+            StickerTemplate.creator_wallet.in_(missing),
+            StickerTemplate.category.in_(_ROUTED_TEMPLATE_CATEGORIES),
+        )
+        .order_by(StickerTemplate.id)
+    )
+    loaded: dict[tuple[str, str], _TemplateRef] = {}
+    for wallet, category, template_id, name, metadata_url in result.all():
+        loaded.setdefault((wallet, category), _TemplateRef(template_id, name, metadata_url))
+
+    for wallet in missing:
+        for category in _ROUTED_TEMPLATE_CATEGORIES:
+            _template_cache[(wallet, category)] = loaded.get((wallet, category))
+
+
+async def _get_template(db, creator_wallet: str, category: str) -> Optional[_TemplateRef]:
+    """Look up a creator's template for a category (cached until templates change)."""
+
+    key = (creator_wallet, category)
+    if key not in _template_cache:
+        result = await db.execute(
+            select(StickerTemplate.id, StickerTemplate.name, StickerTemplate.metadata_url)
+            .where(
+                StickerTemplate.creator_wallet == creator_wallet,
+                StickerTemplate.category == category,
+            )
+            .order_by(StickerTemplate.id)
+        )
+        row = result.first()
+        _template_cache[key] = _TemplateRef(*row) if row else None
+    return _template_cache[key]
 
 
 # ════════════════════════════════════════════════════════════════════
@@ -116,8 +320,6 @@ _last_membership_expiry_cleanup: Optional[datetime] = None
 
 async def _load_last_round() -> int:
     """Load last processed round from DB. Returns 0 if no state exists."""
-    from db_models import ListenerState
-    from sqlalchemy import select
 
     async with async_session() as db:
         result = await db.execute(select(ListenerState).where(ListenerState.id == 1))
@@ -127,32 +329,95 @@ async def _load_last_round() -> int:
     return 0
 
 
-async def _save_last_round(round_num: int):
-    """Persist last processed round to DB."""
-    from db_models import ListenerState
-    from sqlalchemy import select
+async def _save_last_round(db, round_num: int):
+    """
+    Persist last processed round to DB (caller commits).
 
-    async with async_session() as db:
-        result = await db.execute(select(ListenerState).where(ListenerState.id == 1))
-        state = result.scalar_one_or_none()
-        if state:
-            state.last_processed_round = round_num
-            state.updated_at = datetime.utcnow()
-        else:
-            state = ListenerState(id=1, last_processed_round=round_num)
-            db.add(state)
-        await db.commit()
+    Single INSERT ... ON CONFLICT DO UPDATE on the caller's session instead
+    of SELECT + UPDATE/INSERT in a session of its own. updated_at is stamped
+    by the database (CURRENT_TIMESTAMP, UTC) rather than a Python clock read.
+    """
+
+    stmt = sqlite_insert(ListenerState).values(
+        id=1, last_processed_round=round_num, updated_at=func.now(),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={"last_processed_round": round_num, "updated_at": func.now()},
+    )
+    await db.execute(stmt)
+
+
+def _round_persist_due(round_num: int, now: float) -> bool:
+    """True once `round_num` has drifted far enough from the DB copy."""
+    if round_num <= _persisted_round:
+        return False
+    return (
+        round_num - _persisted_round >= settings.listener_round_persist_interval
+        or now - _last_persist_mono >= settings.listener_round_persist_seconds
+    )
+
+
+async def _flush_last_round() -> None:
+    """Persist any not-yet-written round on shutdown (best-effort)."""
+    global _persisted_round
+    if _last_processed_round <= _persisted_round:
+        return
+    try:
+        async with async_session() as db:
+            await _save_last_round(db, _last_processed_round)
+            await db.commit()
+        _persisted_round = _last_processed_round
+    except Exception as e:
+        logger.warning(f"Could not persist last round {_last_processed_round} on stop: {e}")
 
 
 # ════════════════════════════════════════════════════════════════════
 # Indexer Client — Fix #12: Pagination
 # ════════════════════════════════════════════════════════════════════
 
+# Contracts are queried concurrently; cap in-flight Indexer queries so a
+# creator-heavy deployment doesn't hammer the Indexer every cycle
+# (held per page request, see _query_indexer).
+_INDEXER_CONCURRENCY = 8
+
+# Per-contract, per-cycle cap on fetched txns (bounds cycle memory)
+_MAX_TXNS_PER_QUERY = 1000
+
+# Txns per Indexer page (Indexer's default max), so the cap is one round trip
+_INDEXER_PAGE_LIMIT = 1000
+
+# tx_ids per dedup IN (...) query (old SQLite builds allow 999 parameters)
+_DEDUP_CHUNK_SIZE = 500
+_indexer_semaphore = asyncio.Semaphore(_INDEXER_CONCURRENCY)
+
+# Indexer HTTP timeouts (seconds): fail fast on connect, allow slow pages
+_HTTP_TIMEOUTS = {"connect": 5.0, "read": 15.0, "write": 5.0, "pool": 5.0}
+
+# Shared HTTP client: Indexer pages, concurrent contract queries and the
+# per-cycle algod status probe reuse pooled keep-alive (HTTP/2 multiplexed)
+# connections instead of a fresh TCP+TLS handshake per request.
+# Created in start(), closed in stop().
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client (created on demand if start() was skipped)."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(**_HTTP_TIMEOUTS),
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _http_client
+
 
 async def _query_indexer(
     app_id: int,
     min_round: int,
-) -> list:
+    next_token: Optional[str] = None,
+) -> tuple[list, Optional[str]]:
     """
     Query Algorand Indexer for ApplicationCall transactions to a specific app.
 
@@ -160,56 +425,67 @@ async def _query_indexer(
     Follows next-token pagination to ensure no transactions are missed when
     more results exist than fit in a single page.
 
+    Stops at _MAX_TXNS_PER_QUERY and hands back the pending next-token, so a
+    high-volume contract resumes from that page next cycle instead of
+    re-fetching its earliest pages.
+
     Phase 7: Exponential backoff retry on transient failures.
 
     Args:
         app_id: TipProxy application ID
         min_round: Minimum round to search from
+        next_token: Indexer next-token to resume from (None = first page)
 
     Returns:
-        List of transaction dicts from the Indexer
+        (transactions, pending_next_token) — the token is None once the
+        results are exhausted
     """
     url = f"{settings.algorand_indexer_url}/v2/transactions"
+    # Ask for full-size pages explicitly: Indexer deployments (and hosted
+    # providers) may default to smaller pages, which multiplies round trips.
     base_params = {
         "application-id": app_id,
         "tx-type": "appl",
         "min-round": min_round,
+        "limit": _INDEXER_PAGE_LIMIT,
     }
 
+    start_token = next_token
     all_transactions = []
-    next_token = None
     max_retries = 4
     base_delay = 2.0
 
     for attempt in range(max_retries):
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                while True:
-                    params = {**base_params}
-                    if next_token:
-                        params["next"] = next_token
-
+            client = _get_http_client()
+            while True:
+                params = {**base_params}
+                if next_token:
+                    params["next"] = next_token
+
+                # Bound in-flight requests, not whole paginations: a busy
+                # contract's later pages queue behind other contracts'
+                # first pages instead of pinning a slot for its whole walk.
+                async with _indexer_semaphore:
                     response = await client.get(url, params=params)
-                    response.raise_for_status()
-                    data = response.json()
-
-                    txns = data.get("transactions", [])
-                    all_transactions.extend(txns)
-
-                    # Check for more pages
-                    next_token = data.get("next-token")
-                    if not next_token or not txns:
-                        break
-
-                    # Safety: cap at 1000 txns per cycle to prevent runaway loops
-                    if len(all_transactions) >= 1000:
-                        logger.warning(
-                            f"Indexer pagination cap reached for app {app_id} "
-                            f"({len(all_transactions)} txns). Remaining will be caught next cycle."
-                        )
-                        break
-
-            return all_transactions
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+
+                txns = data.get("transactions", [])
+                all_transactions.extend(txns)
+
+                # Check for more pages
+                next_token = data.get("next-token")
+                if not next_token or not txns:
+                    return all_transactions, None
+
+                # Safety: cap txns per cycle; resume from next_token next cycle
+                if len(all_transactions) >= _MAX_TXNS_PER_QUERY:
+                    logger.warning(
+                        f"Indexer pagination cap reached for app {app_id} "
+                        f"({len(all_transactions)} txns). Resuming from next-token next cycle."
+                    )
+                    return all_transactions, next_token
 
         except Exception as e:
             get_listener_metrics().record_indexer_error()
@@ -225,18 +501,34 @@ async def _query_indexer(
                 )
                 await asyncio.sleep(delay)
                 all_transactions = []
-                next_token = None
+                next_token = start_token
             else:
                 logger.warning(f"Indexer query failed for app {app_id}: {e}")
-                return all_transactions
+                return all_transactions, None
 
-    return all_transactions
+    return all_transactions, None
 
 
 # ════════════════════════════════════════════════════════════════════
 # Log Parser
 # ════════════════════════════════════════════════════════════════════
 
+# fan public key (32 bytes) + amount (uint64 big-endian), unpacked in one call
+_LOG_HEADER = struct.Struct(">32sQ")
+_LOG_HEADER_SIZE = _LOG_HEADER.size  # 40 bytes; the memo follows
+
+
+@lru_cache(maxsize=4096)
+def _encode_fan_address(fan_pk: bytes) -> str:
+    """Encode a fan public key to an address; repeat tippers hit the cache."""
+    return algo_encoding.encode_address(fan_pk)
+
+
+@lru_cache(maxsize=1024)
+def _decode_memo(memo_bytes: bytes) -> str:
+    """Decode a tip memo; most tips reuse a handful of memos (MEMBERSHIP:BAUNI, ...)."""
+    return memo_bytes.decode("utf-8", errors="ignore")
+
 
 def parse_tip_log(txn: dict) -> Optional[dict]:
     """
@@ -247,38 +539,34 @@ def parse_tip_log(txn: dict) -> Optional[dict]:
         amount       — 8 bytes (uint64, big-endian, in microAlgos)
         memo         — remaining bytes (UTF-8 string)
 
+    The fan's public key is returned raw; callers encode it to an address
+    (SHA-512/256 checksum) only for tips they actually record.
+
     Args:
         txn: Transaction dict from the Indexer
 
     Returns:
-        dict: {fan_wallet, amount_micro, memo} or None
+        dict: {fan_pk, amount_micro, memo} or None
     """
     logs = txn.get("logs", [])
     if not logs:
         return None
 
     try:
-        raw = base64.b64decode(logs[0])
+        raw = pybase64.b64decode(logs[0], validate=False)  # SIMD decode
     except Exception:
         return None
 
     # Minimum: 32 (address) + 8 (uint64) = 40 bytes
-    if len(raw) < 40:
+    if len(raw) < _LOG_HEADER_SIZE:
         return None
 
-    fan_address_bytes = raw[:32]
-    amount_micro = int.from_bytes(raw[32:40], "big")
-    memo_bytes = raw[40:]
-
-    try:
-        fan_wallet = algo_encoding.encode_address(fan_address_bytes)
-    except Exception:
-        return None
+    fan_pk, amount_micro = _LOG_HEADER.unpack_from(raw, 0)
 
     return {
-        "fan_wallet": fan_wallet,
+        "fan_pk": fan_pk,
         "amount_micro": amount_micro,
-        "memo": memo_bytes.decode("utf-8", errors="ignore"),
+        "memo": _decode_memo(raw[_LOG_HEADER_SIZE:]),
     }
 
 
@@ -287,6 +575,200 @@ def parse_tip_log(txn: dict) -> Optional[dict]:
 # ════════════════════════════════════════════════════════════════════
 
 
+# "ORDER:<id>" — order id parsed in one match instead of split/split/int
+_ORDER_MEMO_RE = re.compile(r"ORDER:\s*(\d+)(?:\s|$)")
+
+
+async def _route_order(tx_record, db, memo_upper: str, now: datetime) -> bool:
+    """Path 0: MERCH ORDER settlement. Never short-circuits the Butki path."""
+    m = _ORDER_MEMO_RE.match(memo_upper)
+    order_id = int(m.group(1)) if m else None
+
+    if order_id is not None:
+        amount_algo = tx_record.amount_micro / 1_000_000
+        settled = await merch_service.settle_order_payment(
+            db=db,
+            order_id=order_id,
+            fan_wallet=tx_record.fan_wallet,
+            creator_wallet=tx_record.creator_wallet,
+            amount_algo=amount_algo,
+            tx_id=tx_record.tx_id,
+            now=now,
+        )
+        if settled:
+            logger.info(
+                f"  [MERCH] Order {order_id} settled from tip {tx_record.tx_id} "
+                f"({amount_algo:.2f} ALGO)"
+            )
+    return False
+
+
+async def _route_bauni(tx_record, db, memo_upper: str, now: datetime) -> bool:
+    """Path 1: BAUNI membership purchase ("MEMBERSHIP:BAUNI" with >= 5 ALGO)."""
+    creator_wallet = tx_record.creator_wallet
+    fan_wallet = tx_record.fan_wallet
+    amount_micro = tx_record.amount_micro
+    amount_algo = amount_micro / 1_000_000
+
+    # Idempotency: if this tip tx already created a membership, do nothing
+    try:
+        existing_membership = await db.execute(
+            select(Membership.id).where(Membership.purchase_tx_id == tx_record.tx_id)
+        )
+        if existing_membership.first():
+            logger.info(f"  Bauni: already processed tx {tx_record.tx_id}, skipping")
+            return True
+    except Exception:
+        # Best-effort; if the check fails, proceed and rely on DB constraints downstream
+        pass
+
+    if amount_algo < bauni_service.BAUNI_COST_ALGO:
+        logger.warning(
+            f"  Bauni: insufficient amount {amount_algo:.2f} ALGO "
+            f"(need {bauni_service.BAUNI_COST_ALGO}) from {fan_wallet[:8]}..."
+        )
+        return True
+
+    # Find Bauni template
+    template = await _get_template(db, creator_wallet, "bauni_membership")
+
+    if not template or not template.metadata_url:
+        logger.warning(f"  Bauni: no template found for creator {creator_wallet[:8]}...")
+        return True
+
+    try:
+        # Mint + transfer to fan (Phase 7: async to avoid blocking event loop)
+        asset_id, xfer = await nft_service.mint_and_send_async(
+            name=template.name[:32],
+            metadata_url=template.metadata_url,
+            sticker_type="soulbound",
+            unit_name="BAUNI",
+            fan_wallet=fan_wallet,
+            fan_private_key=_get_demo_fan_key(fan_wallet),
+        )
+
+        nft = NFT(
+            asset_id=asset_id,
+            template_id=template.id,
+            owner_wallet=fan_wallet,
+            sticker_type="soulbound",
+            nft_class="bauni",
+            tx_id=xfer["tx_id"],
+            delivery_status=xfer["status"],
+        )
+        db.add(nft)
+
+        # Record membership (handles renewal logic)
+        membership_result = await bauni_service.purchase_membership(
+            db=db,
+            fan_wallet=fan_wallet,
+            creator_wallet=creator_wallet,
+            asset_id=asset_id,
+            purchase_tx_id=tx_record.tx_id,
+            amount_paid_micro=amount_micro,
+            now=now,
+        )
+
+        nft.expires_at = membership_result["expires_at"]
+        renewal_str = "RENEWAL" if membership_result["is_renewal"] else "NEW"
+        logger.info(
+            f"  [BAUNI {renewal_str}] Membership minted for {fan_wallet[:8]}... "
+            f"(ASA: {asset_id}, expires: {membership_result['expires_at'].isoformat()})"
+        )
+    except Exception as e:
+        logger.error(f"Bauni mint failed: {e}")
+        raise
+    return True
+
+
+async def _route_shawty(tx_record, db, memo_upper: str, now: datetime) -> bool:
+    """Path 2: SHAWTY store purchase ("PURCHASE:SHAWTY" with >= 2 ALGO)."""
+    creator_wallet = tx_record.creator_wallet
+    fan_wallet = tx_record.fan_wallet
+    amount_micro = tx_record.amount_micro
+    amount_algo = amount_micro / 1_000_000
+
+    # Idempotency: if this tip tx already registered a token, do nothing
+    try:
+        existing_token = await db.execute(
+            select(ShawtyToken.id).where(ShawtyToken.purchase_tx_id == tx_record.tx_id)
+        )
+        if existing_token.first():
+            logger.info(f"  Shawty: already processed tx {tx_record.tx_id}, skipping")
+            return True
+    except Exception:
+        pass
+
+    if amount_algo < shawty_service.SHAWTY_COST_ALGO:
+        logger.warning(
+            f"  Shawty: insufficient amount {amount_algo:.2f} ALGO "
+            f"(need {shawty_service.SHAWTY_COST_ALGO}) from {fan_wallet[:8]}..."
+        )
+        return True
+
+    # Find Shawty template
+    template = await _get_template(db, creator_wallet, "shawty_collectible")
+
+    if not template or not template.metadata_url:
+        logger.warning(f"  Shawty: no template found for creator {creator_wallet[:8]}...")
+        return True
+
+    try:
+        # Mint + transfer to fan (Phase 7: async)
+        asset_id, xfer = await nft_service.mint_and_send_async(
+            name=template.name[:32],
+            metadata_url=template.metadata_url,
+            sticker_type="golden",
+            unit_name="SHAWTY",
+            fan_wallet=fan_wallet,
+            fan_private_key=_get_demo_fan_key(fan_wallet),
+        )
+
+        nft = NFT(
+            asset_id=asset_id,
+            template_id=template.id,
+            owner_wallet=fan_wallet,
+            sticker_type="golden",
+            nft_class="shawty",
+            tx_id=xfer["tx_id"],
+            delivery_status=xfer["status"],
+        )
+        db.add(nft)
+
+        # Register in Shawty tracking table
+        await shawty_service.register_purchase(
+            db=db,
+            asset_id=asset_id,
+            owner_wallet=fan_wallet,
+            creator_wallet=creator_wallet,
+            purchase_tx_id=tx_record.tx_id,
+            amount_paid_micro=amount_micro,
+        )
+
+        logger.info(
+            f"  [SHAWTY] Golden collectible minted for {fan_wallet[:8]}... "
+            f"(ASA: {asset_id}, cost: {amount_algo:.2f} ALGO)"
+        )
+    except Exception as e:
+        logger.error(f"Shawty mint failed: {e}")
+        raise
+    return True
+
+
+# Memo routing: first ":"-token -> (full prefix, handler). One dict lookup
+# picks the path instead of a startswith chain; the full prefix is still
+# checked so e.g. "MEMBERSHIP:OTHER" falls through to Butki as before.
+# A handler returns True when it fully handled the tip (skip Butki).
+_MEMO_ROUTER = {
+    prefix.split(":", 1)[0]: (prefix, handler)
+    for prefix, handler in (
+        (MEMO_ORDER_PREFIX, _route_order),
+        (MEMO_BAUNI_PREFIX, _route_bauni),
+        (MEMO_SHAWTY_PREFIX, _route_shawty),
+    )
+}
+
+
 async def route_tip(tx_record, db):
     """
     Route a verified tip through the structured NFT utility pipeline.
@@ -313,10 +795,6 @@ async def route_tip(tx_record, db):
         tx_record: Transaction DB record
         db: AsyncSession
     """
-    from db_models import StickerTemplate, NFT
-    from services import nft_service
-    from services import butki_service, bauni_service, shawty_service, merch_service
-    from sqlalchemy import select
 
     memo = tx_record.memo or ""
     creator_wallet = tx_record.creator_wallet
@@ -324,195 +802,15 @@ async def route_tip(tx_record, db):
     amount_micro = tx_record.amount_micro
     amount_algo = amount_micro / 1_000_000
     memo_upper = memo.strip().upper()
+    # One clock read per tip, shared by every timestamp this route writes
+    now = datetime.utcnow()
 
-    # ── Path 0: MERCH ORDER settlement (does not short-circuit other rewards) ──
-    from domain.constants import MEMO_ORDER_PREFIX, MEMO_BAUNI_PREFIX, MEMO_SHAWTY_PREFIX
-
-    if memo_upper.startswith(MEMO_ORDER_PREFIX):
-        try:
-            order_id_str = memo_upper.split(MEMO_ORDER_PREFIX)[1].split()[0]
-            order_id = int(order_id_str)
-        except Exception:
-            order_id = None
-
-        if order_id is not None:
-            settled = await merch_service.settle_order_payment(
-                db=db,
-                order_id=order_id,
-                fan_wallet=fan_wallet,
-                creator_wallet=creator_wallet,
-                amount_algo=amount_algo,
-                tx_id=tx_record.tx_id,
-            )
-            if settled:
-                logger.info(
-                    f"  [MERCH] Order {order_id} settled from tip {tx_record.tx_id} "
-                    f"({amount_algo:.2f} ALGO)"
-                )
-
-    # ── Path 1: BAUNI Membership Purchase ──────────────────────
-    # Triggered by memo "MEMBERSHIP:BAUNI" with >= 5 ALGO
-    if memo_upper.startswith(MEMO_BAUNI_PREFIX):
-        # Idempotency: if this tip tx already created a membership, do nothing
-        try:
-            from db_models import Membership
-            existing_membership = await db.execute(
-                select(Membership).where(Membership.purchase_tx_id == tx_record.tx_id)
-            )
-            if existing_membership.scalar_one_or_none():
-                logger.info(f"  Bauni: already processed tx {tx_record.tx_id}, skipping")
-                return
-        except Exception:
-            # Best-effort; if the check fails, proceed and rely on DB constraints downstream
-            pass
-
-        if amount_algo < bauni_service.BAUNI_COST_ALGO:
-            logger.warning(
-                f"  Bauni: insufficient amount {amount_algo:.2f} ALGO "
-                f"(need {bauni_service.BAUNI_COST_ALGO}) from {fan_wallet[:8]}..."
-            )
-            return
-
-        # Find Bauni template
-        result = await db.execute(
-            select(StickerTemplate).where(
-                StickerTemplate.creator_wallet == creator_wallet,
-                StickerTemplate.category == "bauni_membership",
-            )
-        )
-        template = result.scalar_one_or_none()
-
-        if not template or not template.metadata_url:
-            logger.warning(f"  Bauni: no template found for creator {creator_wallet[:8]}...")
-            return
-
-        try:
-            asset_id = await nft_service.mint_soulbound_sticker_async(
-                name=template.name[:32],
-                metadata_url=template.metadata_url,
-                unit_name="BAUNI",
-            )
-
-            nft = NFT(
-                asset_id=asset_id,
-                template_id=template.id,
-                owner_wallet=fan_wallet,
-                sticker_type="soulbound",
-                nft_class="bauni",
-            )
-            db.add(nft)
-
-            # Transfer to fan (Phase 7: async to avoid blocking event loop)
-            try:
-                fan_pk = _get_demo_fan_key(fan_wallet)
-                xfer = await nft_service.send_nft_to_fan_async(asset_id, fan_wallet, fan_private_key=fan_pk)
-                nft.tx_id = xfer["tx_id"]
-                nft.delivery_status = xfer["status"]
-            except Exception as e:
-                nft.delivery_status = "failed"
-                logger.warning(f"Bauni transfer failed: {e}")
-
-            # Record membership (handles renewal logic)
-            membership_result = await bauni_service.purchase_membership(
-                db=db,
-                fan_wallet=fan_wallet,
-                creator_wallet=creator_wallet,
-                asset_id=asset_id,
-                purchase_tx_id=tx_record.tx_id,
-                amount_paid_micro=amount_micro,
-            )
-
-            nft.expires_at = membership_result["expires_at"]
-            renewal_str = "RENEWAL" if membership_result["is_renewal"] else "NEW"
-            logger.info(
-                f"  [BAUNI {renewal_str}] Membership minted for {fan_wallet[:8]}... "
-                f"(ASA: {asset_id}, expires: {membership_result['expires_at'].isoformat()})"
-            )
-        except Exception as e:
-            logger.error(f"Bauni mint failed: {e}")
-            raise
-        return
-
-    # ── Path 2: SHAWTY Store Purchase ──────────────────────────
-    # Triggered by memo "PURCHASE:SHAWTY" with >= 2 ALGO
-    if memo_upper.startswith(MEMO_SHAWTY_PREFIX):
-        # Idempotency: if this tip tx already registered a token, do nothing
-        try:
-            from db_models import ShawtyToken
-            existing_token = await db.execute(
-                select(ShawtyToken).where(ShawtyToken.purchase_tx_id == tx_record.tx_id)
-            )
-            if existing_token.scalar_one_or_none():
-                logger.info(f"  Shawty: already processed tx {tx_record.tx_id}, skipping")
-                return
-        except Exception:
-            pass
-
-        if amount_algo < shawty_service.SHAWTY_COST_ALGO:
-            logger.warning(
-                f"  Shawty: insufficient amount {amount_algo:.2f} ALGO "
-                f"(need {shawty_service.SHAWTY_COST_ALGO}) from {fan_wallet[:8]}..."
-            )
+    # ── Paths 0-2: memo-prefixed ORDER / BAUNI / SHAWTY ────────
+    route = _MEMO_ROUTER.get(memo_upper.split(":", 1)[0])
+    if route is not None and memo_upper.startswith(route[0]):
+        if await route[1](tx_record, db, memo_upper, now):
             return
 
-        # Find Shawty template
-        result = await db.execute(
-            select(StickerTemplate).where(
-                StickerTemplate.creator_wallet == creator_wallet,
-                StickerTemplate.category == "shawty_collectible",
-            )
-        )
-        template = result.scalar_one_or_none()
-
-        if not template or not template.metadata_url:
-            logger.warning(f"  Shawty: no template found for creator {creator_wallet[:8]}...")
-            return
-
-        try:
-            asset_id = await nft_service.mint_golden_sticker_async(
-                name=template.name[:32],
-                metadata_url=template.metadata_url,
-                unit_name="SHAWTY",
-            )
-
-            nft = NFT(
-                asset_id=asset_id,
-                template_id=template.id,
-                owner_wallet=fan_wallet,
-                sticker_type="golden",
-                nft_class="shawty",
-            )
-            db.add(nft)
-
-            # Transfer to fan (Phase 7: async)
-            try:
-                fan_pk = _get_demo_fan_key(fan_wallet)
-                xfer = await nft_service.send_nft_to_fan_async(asset_id, fan_wallet, fan_private_key=fan_pk)
-                nft.tx_id = xfer["tx_id"]
-                nft.delivery_status = xfer["status"]
-            except Exception as e:
-                nft.delivery_status = "failed"
-                logger.warning(f"Shawty transfer failed: {e}")
-
-            # Register in Shawty tracking table
-            await shawty_service.register_purchase(
-                db=db,
-                asset_id=asset_id,
-                owner_wallet=fan_wallet,
-                creator_wallet=creator_wallet,
-                purchase_tx_id=tx_record.tx_id,
-                amount_paid_micro=amount_micro,
-            )
-
-            logger.info(
-                f"  [SHAWTY] Golden collectible minted for {fan_wallet[:8]}... "
-                f"(ASA: {asset_id}, cost: {amount_algo:.2f} ALGO)"
-            )
-        except Exception as e:
-            logger.error(f"Shawty mint failed: {e}")
-            raise
-        return
-
     # ── Path 3: BUTKI Loyalty Tip (default for regular tips) ───
     # Any tip >= 0.5 ALGO increments the fan's loyalty counter.
     # Every 5th tip earns a Butki loyalty badge NFT.
@@ -530,6 +828,7 @@ async def route_tip(tx_record, db):
         creator_wallet=creator_wallet,
         tx_id=tx_record.tx_id,
         amount_micro=amount_micro,
+        now=now,
     )
 
     tip_count = loyalty_result["tip_count"]
@@ -542,21 +841,18 @@ async def route_tip(tx_record, db):
 
     # Mint a Butki badge only on every 5th tip
     if earned_badge:
-        result = await db.execute(
-            select(StickerTemplate).where(
-                StickerTemplate.creator_wallet == creator_wallet,
-                StickerTemplate.category == "butki_badge",
-            )
-        )
-        butki_template = result.scalar_one_or_none()
+        butki_template = await _get_template(db, creator_wallet, "butki_badge")
 
         if butki_template and butki_template.metadata_url:
             try:
                 badge_number = loyalty_result["badges_total"]
-                asset_id = await nft_service.mint_soulbound_sticker_async(
+                asset_id, xfer = await nft_service.mint_and_send_async(
                     name=f"Butki Badge #{badge_number}"[:32],
                     metadata_url=butki_template.metadata_url,
+                    sticker_type="soulbound",
                     unit_name="BUTKI",
+                    fan_wallet=fan_wallet,
+                    fan_private_key=_get_demo_fan_key(fan_wallet),
                 )
                 nft = NFT(
                     asset_id=asset_id,
@@ -564,18 +860,11 @@ async def route_tip(tx_record, db):
                     owner_wallet=fan_wallet,
                     sticker_type="soulbound",
                     nft_class="butki",
+                    tx_id=xfer["tx_id"],
+                    delivery_status=xfer["status"],
                 )
                 db.add(nft)
 
-                try:
-                    fan_pk = _get_demo_fan_key(fan_wallet)
-                    xfer = await nft_service.send_nft_to_fan_async(asset_id, fan_wallet, fan_private_key=fan_pk)
-                    nft.tx_id = xfer["tx_id"]
-                    nft.delivery_status = xfer["status"]
-                except Exception as e:
-                    nft.delivery_status = "failed"
-                    logger.warning(f"Butki badge transfer failed: {e}")
-
                 # Store asset ID in loyalty record
                 await butki_service.record_badge_asset(
                     db=db,
@@ -606,6 +895,11 @@ MAX_RETRY_ATTEMPTS = 3
 # Phase 7: Exponential backoff base (60, 120, 240 seconds)
 RETRY_BASE_SECONDS = 60
 RETRY_MAX_SECONDS = 300
+# Dead-letter rows routed per retry batch
+_RETRY_BATCH_SIZE = 50
+# Never-retried rows younger than this may still be on their way to a
+# mint worker; leave them to the worker
+_RETRY_GRACE_SECONDS = 120
 
 
 def _retry_delay_for_attempt(attempt: int) -> float:
@@ -620,6 +914,89 @@ def _is_transient_error(e: Exception) -> bool:
     return any(kw in err_str for kw in transient_keywords)
 
 
+async def _retry_batch(db, after_id: int) -> Optional[int]:
+    """
+    Retry one batch of failed mints with id > after_id.
+
+    Returns:
+        The last id in the batch if more rows may follow, else None
+    """
+    # Find unprocessed transactions (failed mints); rows that exhausted
+    # their attempts are filtered out in SQL. Keyset on id: each batch is
+    # a seek on the partial ix_transactions_unprocessed index, no OFFSET.
+    grace_cutoff = datetime.utcnow() - timedelta(seconds=_RETRY_GRACE_SECONDS)
+    result = await db.execute(
+        select(Transaction)
+        .where(
+            Transaction.processed == False,
+            Transaction.retry_count < MAX_RETRY_ATTEMPTS,
+            Transaction.id > after_id,
+            or_(Transaction.retry_count > 0, Transaction.detected_at < grace_cutoff),
+        )
+        .order_by(Transaction.id)
+        .limit(_RETRY_BATCH_SIZE)
+    )
+    failed_txns = result.scalars().all()
+
+    if not failed_txns:
+        return None
+    last_id = failed_txns[-1].id
+
+    logger.info(f"  Retrying {len(failed_txns)} failed mint(s)...")
+
+    for tx_record in failed_txns:
+        # Still queued / in flight in a mint worker — not a failure
+        if mint_worker.is_pending(tx_record.tx_id):
+            continue
+
+        # Read up front: a rolled-back savepoint expires the row
+        tx_id = tx_record.tx_id
+        fan_wallet = tx_record.fan_wallet
+        amount_micro = tx_record.amount_micro
+        retry_count = tx_record.retry_count
+
+        try:
+            # Savepoint per tip: a failure rolls back only this
+            # tip's partial writes, the batch still commits once
+            async with db.begin_nested():
+                # Claim the row: a mint worker may have finished it since
+                # the batch was read, and routing it again mints twice
+                claim = await db.execute(
+                    update(Transaction)
+                    .where(Transaction.id == tx_record.id, Transaction.processed == False)
+                    .values(processed=True)
+                )
+                if claim.rowcount == 0:
+                    continue
+                await route_tip(tx_record, db)
+            get_listener_metrics().record_retry_success()
+            logger.info(f"  Retry SUCCESS: tx {tx_id} (attempt {retry_count + 1})")
+        except Exception as e:
+            get_listener_metrics().record_retry_fail()
+            tx_record.retry_count = retry_count + 1
+            if not _is_transient_error(e) and retry_count >= 1:
+                tx_record.processed = True
+                logger.error(f"  Permanent error on tx {tx_id}, abandoning: {e}")
+            elif retry_count + 1 >= MAX_RETRY_ATTEMPTS:
+                tx_record.processed = True  # Give up — prevent infinite loop
+                logger.error(
+                    f"  ABANDONED: tx {tx_id} failed after "
+                    f"{MAX_RETRY_ATTEMPTS} retries. Fan {fan_wallet[:8]}... "
+                    f"tipped {amount_micro / 1_000_000:.2f} ALGO but "
+                    f"never received NFT. Manual intervention required."
+                )
+            else:
+                logger.warning(
+                    f"  Retry FAILED: tx {tx_id} "
+                    f"(attempt {retry_count + 1}/{MAX_RETRY_ATTEMPTS}): {e}"
+                )
+
+    # One commit for the whole batch
+    await db.commit()
+
+    return last_id if len(failed_txns) == _RETRY_BATCH_SIZE else None
+
+
 async def _retry_failed_mints():
     """
     Background task that periodically retries failed mint operations.
@@ -629,8 +1006,6 @@ async def _retry_failed_mints():
     After max attempts, marks as processed with a logged error to
     prevent infinite retry loops.
     """
-    from db_models import Transaction
-    from sqlalchemy import select
 
     logger.info(f"Retry task started (exponential backoff, max {MAX_RETRY_ATTEMPTS} attempts)")
 
@@ -638,61 +1013,15 @@ async def _retry_failed_mints():
     while _is_running:
         try:
             delay = _retry_delay_for_attempt(min(cycle // 3, 2))  # 0,1,2 -> 60s; 3,4,5 -> 120s; 6+ -> 240s
-            await asyncio.sleep(delay)
+            if await _wait_for_stop(delay):
+                break
             cycle += 1
 
+            # Walk the whole dead-letter set in keyset-paginated batches
             async with async_session() as db:
-                # Find unprocessed transactions (failed mints)
-                result = await db.execute(
-                    select(Transaction).where(
-                        Transaction.processed == False
-                    ).limit(10)  # Process in small batches
-                )
-                failed_txns = result.scalars().all()
-
-                if not failed_txns:
-                    continue
-
-                logger.info(f"  Retrying {len(failed_txns)} failed mint(s)...")
-
-                for tx_record in failed_txns:
-                    # Track retry count via memo prefix (lightweight approach)
-                    retry_count = _get_retry_count(tx_record)
-
-                    if retry_count >= MAX_RETRY_ATTEMPTS:
-                        tx_record.processed = True  # Give up — prevent infinite loop
-                        get_listener_metrics().record_retry_fail()
-                        logger.error(
-                            f"  ABANDONED: tx {tx_record.tx_id} failed after "
-                            f"{MAX_RETRY_ATTEMPTS} retries. Fan {tx_record.fan_wallet[:8]}... "
-                            f"tipped {tx_record.amount_micro / 1_000_000:.2f} ALGO but "
-                            f"never received NFT. Manual intervention required."
-                        )
-                        continue
-
-                    try:
-                        await route_tip(tx_record, db)
-                        tx_record.processed = True
-                        get_listener_metrics().record_retry_success()
-                        logger.info(
-                            f"  Retry SUCCESS: tx {tx_record.tx_id} "
-                            f"(attempt {retry_count + 1})"
-                        )
-                    except Exception as e:
-                        get_listener_metrics().record_retry_fail()
-                        if not _is_transient_error(e) and retry_count >= 1:
-                            tx_record.processed = True
-                            logger.error(
-                                f"  Permanent error on tx {tx_record.tx_id}, abandoning: {e}"
-                            )
-                        else:
-                            _increment_retry_count(tx_record)
-                            logger.warning(
-                                f"  Retry FAILED: tx {tx_record.tx_id} "
-                                f"(attempt {retry_count + 1}/{MAX_RETRY_ATTEMPTS}): {e}"
-                            )
-
-                await db.commit()
+                after_id = 0
+                while after_id is not None and not _stop_event.is_set():
+                    after_id = await _retry_batch(db, after_id)
 
         except asyncio.CancelledError:
             break
@@ -700,29 +1029,6 @@ async def _retry_failed_mints():
             logger.error(f"Retry task error: {e}")
 
 
-def _get_retry_count(tx_record) -> int:
-    """Extract retry count from memo (stored as __RETRY:N suffix)."""
-    memo = tx_record.memo or ""
-    if "__RETRY:" in memo:
-        try:
-            return int(memo.split("__RETRY:")[-1])
-        except (ValueError, IndexError):
-            return 0
-    return 0
-
-
-def _increment_retry_count(tx_record):
-    """Increment the retry counter stored in the memo field."""
-    memo = tx_record.memo or ""
-    current = _get_retry_count(tx_record)
-    if "__RETRY:" in memo:
-        # Replace existing count
-        prefix = memo.split("__RETRY:")[0]
-        tx_record.memo = f"{prefix}__RETRY:{current + 1}"
-    else:
-        tx_record.memo = f"{memo}__RETRY:{current + 1}"
-
-
 # ════════════════════════════════════════════════════════════════════
 # Main Listener Loop
 # ════════════════════════════════════════════════════════════════════
@@ -736,144 +1042,252 @@ async def _listener_loop():
     1. Gets all active TipProxy app_ids from DB
     2. Queries Indexer for new ApplicationCall txns since last_round
     3. Parses tip logs and deduplicates against DB
-    4. Routes new tips through the minting pipeline
+    4. Enqueues new tips for the mint workers
     5. Persists last_processed_round to DB (survives restarts)
     """
-    global _last_processed_round, _is_running, _errors_count
-
-    from db_models import Contract, Transaction
-    from sqlalchemy import select
+    global _last_processed_round, _persisted_round, _last_persist_mono
+    global _is_running, _errors_count
 
     _is_running = True
     poll_interval = settings.listener_poll_seconds
 
     # Fix #5: Load persisted round from DB instead of starting at 0
     _last_processed_round = await _load_last_round()
+    _persisted_round = _last_processed_round
+    _last_persist_mono = time.monotonic()
 
     logger.info(
-        f"Listener started (polling every {poll_interval}s, "
+        f"Listener started (new block or every {poll_interval}s, "
         f"resuming from round {_last_processed_round})"
     )
 
+    # Chain tip last reported by algod; each cycle waits for the block after it
+    last_block: Optional[int] = None
+
+    # Adaptive ceiling on the block wait: short right after a cycle that
+    # found tips (the Indexer may still be catching up on a busy block),
+    # doubling per empty cycle back up to poll_interval when idle
+    wait_ceiling = poll_interval
+    empty_cycles = 0
+
     while _is_running:
         try:
-            await asyncio.sleep(poll_interval)
+            # The ceiling only bounds the wait: a new block starts the cycle early
+            stopped, tip = await _wait_for_next_block(last_block, wait_ceiling)
+            if stopped:
+                break
+            if tip is not None:
+                last_block = tip
+                get_listener_metrics().current_round = tip
 
             async with async_session() as db:
                 # Phase 3: periodic membership expiry cleanup (best-effort)
                 try:
-                    global _last_membership_expiry_cleanup
-                    now = datetime.utcnow()
+                    global _last_cleanup_mono
+                    now = time.monotonic()
                     if (
-                        _last_membership_expiry_cleanup is None
-                        or (now - _last_membership_expiry_cleanup).total_seconds() >= 300
+                        _last_cleanup_mono is None
+                        or now - _last_cleanup_mono >= _MEMBERSHIP_EXPIRY_INTERVAL_SECONDS
                     ):
-                        from services import bauni_service
                         expired_count = await bauni_service.expire_memberships(db)
                         if expired_count:
                             logger.info(f"  Bauni expiry cleanup: expired {expired_count} membership(s)")
-                        _last_membership_expiry_cleanup = now
+                        _last_cleanup_mono = now
                 except Exception as e:
                     logger.debug(f"Membership expiry cleanup skipped: {e}")
 
-                # Get all active TipProxy contracts
-                result = await db.execute(
-                    select(Contract).where(Contract.active == True)
-                )
-                active_contracts = result.scalars().all()
+                # Get all active TipProxy contracts (cached until a
+                # contract is registered/upgraded); refresh template cache
+                versions = await cache_version.get_versions(db)
+                _sync_template_cache(versions)
+                active_contracts = await _get_active_contracts(db, versions)
 
                 if not active_contracts:
                     continue  # no contracts to monitor
 
-                new_tip_count = 0
+                # Backpressure: while the mint workers are saturated, don't
+                # ingest more tips. The round isn't advanced, so this cycle's
+                # txns are fetched again once the backlog drains.
+                if mint_worker.is_saturated():
+                    logger.warning(
+                        f"  Mint backlog at {settings.max_inflight_mints}, "
+                        f"skipping ingest this cycle"
+                    )
+                    get_listener_metrics().heartbeat()
+                    continue
+
                 max_round_seen = _last_processed_round
 
-                for contract in active_contracts:
-                    # Query Indexer for new txns (with pagination — Fix #12)
-                    txns = await _query_indexer(
-                        app_id=contract.app_id,
-                        min_round=_last_processed_round,
-                    )
+                # Query Indexer for every active contract concurrently
+                # (with pagination — Fix #12). Cycle time is the slowest
+                # contract's latency instead of the sum over all contracts.
+                results = await asyncio.gather(
+                    *[
+                        _query_indexer(
+                            app_id=c.app_id,
+                            min_round=_last_processed_round,
+                            next_token=_next_tokens.get(c.app_id),
+                        )
+                        for c in active_contracts
+                    ],
+                    return_exceptions=True,
+                )
 
-                    for txn in txns:
-                        tx_id = txn.get("id")
-                        if not tx_id:
-                            continue
+                # Collect this cycle's Indexer txns across all contracts
+                cycle_txns = []  # (contract, txn)
+                token_updates = {}  # app_id -> new pending next-token (or None)
+                round_ceiling = None  # don't advance past a contract with pages pending
+                for contract, res in zip(active_contracts, results):
+                    if isinstance(res, BaseException):
+                        logger.warning(f"Indexer query failed for app {contract.app_id}: {res}")
+                        continue
 
-                        # Track the highest round we've seen
-                        txn_round = txn.get("confirmed-round", 0)
-                        if txn_round > max_round_seen:
-                            max_round_seen = txn_round
+                    txns, pending_token = res
+                    if pending_token != _next_tokens.get(contract.app_id):
+                        token_updates[contract.app_id] = pending_token
 
-                        # Deduplication: skip if already recorded
-                        existing = await db.execute(
-                            select(Transaction).where(Transaction.tx_id == tx_id)
-                        )
-                        if existing.scalar_one_or_none():
-                            continue
-
-                        # Parse the TipProxy log
-                        log_data = parse_tip_log(txn)
-                        if not log_data:
-                            continue  # not a tip() call (e.g., pause/unpause)
-
-                        # Record transaction row first, so failures still leave processed=False for retry task
-                        tx_record = Transaction(
-                            tx_id=tx_id,
-                            fan_wallet=log_data["fan_wallet"],
-                            creator_wallet=contract.creator_wallet,
-                            app_id=contract.app_id,
-                            amount_micro=log_data["amount_micro"],
-                            memo=log_data["memo"],
-                            processed=False,
+                    # Track the highest round we've seen (one C-level max per contract)
+                    contract_max_round = max(
+                        (txn.get("confirmed-round", 0) for txn in txns), default=0
+                    )
+                    # Only tip() emits logs (pause/unpause etc. don't), so
+                    # log-less app calls never reach the parse or dedup passes
+                    cycle_txns.extend(
+                        (contract, txn) for txn in txns if txn.get("logs") and txn.get("id")
+                    )
+
+                    max_round_seen = max(max_round_seen, contract_max_round)
+                    if pending_token and contract_max_round:
+                        # Later pages of this contract start at contract_max_round;
+                        # min-round must not move past them or they'd be skipped.
+                        if round_ceiling is None or contract_max_round < round_ceiling:
+                            round_ceiling = contract_max_round
+
+                if round_ceiling is not None:
+                    max_round_seen = min(max_round_seen, round_ceiling)
+
+                # The rest of the cycle runs as whole-batch passes so each
+                # stage is one bulk operation rather than per-txn work.
+
+                # Pass 1 — parse: keep only well-formed TipProxy tip() logs
+                parsed = [
+                    (contract, txn["id"], log_data)
+                    for contract, txn in cycle_txns
+                    if (log_data := parse_tip_log(txn))
+                ]
+
+                # Pass 2 — dedupe: batched IN queries for the whole cycle,
+                # chunked to stay under the driver's bound-parameter limit
+                existing = set()
+                parsed_ids = [tx_id for _, tx_id, _ in parsed]
+                for i in range(0, len(parsed_ids), _DEDUP_CHUNK_SIZE):
+                    result = await db.execute(
+                        select(Transaction.tx_id).where(
+                            Transaction.tx_id.in_(parsed_ids[i:i + _DEDUP_CHUNK_SIZE])
                         )
-                        db.add(tx_record)
-                        try:
-                            await db.flush()
-                        except Exception:
-                            # Most commonly a unique constraint race; skip and continue.
-                            continue
-
-                        # Process downstream actions inside a SAVEPOINT.
-                        # If minting fails, we keep the Transaction row and leave processed=False.
-                        try:
-                            async with db.begin_nested():
-                                await route_tip(tx_record, db)
-                                tx_record.processed = True
-                            get_listener_metrics().record_tip_processed()
-                        except Exception as e:
-                            get_listener_metrics().record_mint_failed()
-                            logger.error(f"Minting pipeline error for tx {tx_id}: {e}")
-                            # Leave processed=False for retry task.
-
-                        new_tip_count += 1
-
-                # Commit all changes for this cycle
-                await db.commit()
-
-                # Fix #5: Persist last processed round to DB
-                if max_round_seen > _last_processed_round:
-                    _last_processed_round = max_round_seen
-                    await _save_last_round(max_round_seen)
-
-                # Phase 7: Metrics + listener lag (fetch current round from algod)
+                    )
+                    existing.update(result.scalars().all())
+
+                # Pass 3 — build rows for new tips. Record transaction rows
+                # first, so failures still leave processed=False for retry task
+                new_rows = []
+                for contract, tx_id, log_data in parsed:
+                    if tx_id in existing:
+                        continue
+                    existing.add(tx_id)
+                    new_rows.append({
+                        "tx_id": tx_id,
+                        "fan_wallet": _encode_fan_address(log_data["fan_pk"]),
+                        "creator_wallet": contract.creator_wallet,
+                        "app_id": contract.app_id,
+                        "amount_micro": log_data["amount_micro"],
+                        "memo": log_data["memo"],
+                        "processed": False,
+                    })
+
+                # Minting happens in the mint workers, not here. Jobs are
+                # keyed by the on-chain tx_id, so the batch goes out as one
+                # executemany INSERT with no per-row ORM objects or flush.
+                # ON CONFLICT DO NOTHING absorbs a tx_id another writer
+                # recorded since the dedup query; RETURNING yields only the
+                # rows this cycle actually inserted.
+                new_tx_ids = []
+                if new_rows:
+                    result = await db.execute(
+                        sqlite_insert(Transaction)
+                        .on_conflict_do_nothing(index_elements=["tx_id"])
+                        .returning(Transaction.tx_id),
+                        new_rows,
+                    )
+                    new_tx_ids = list(result.scalars().all())
+
+                # Fix #12: remember where each capped contract's pagination stopped
+                for app_id, token in token_updates.items():
+                    await db.execute(
+                        update(Contract)
+                        .where(Contract.app_id == app_id)
+                        .values(last_next_token=token)
+                    )
+
+                # Fix #5: Persist last processed round to DB, coalesced to
+                # one write per persist window and committed atomically
+                # with this cycle's tip rows (no second transaction)
+                new_round = max(max_round_seen, _last_processed_round)
+                now = time.monotonic()
+                persist_round = _round_persist_due(new_round, now)
+                if persist_round:
+                    await _save_last_round(db, new_round)
+
+                # Warm the template cache for the workers before the rows
+                # go out, so nothing is awaited between commit and enqueue
+                if new_tx_ids:
+                    await _preload_templates(db, {row["creator_wallet"] for row in new_rows})
+
+                # Commit all changes for this cycle. The new tips are marked
+                # pending first: once committed the retry task can see them
+                mint_worker.reserve(new_tx_ids)
+                try:
+                    await db.commit()
+                except Exception:
+                    mint_worker.release(new_tx_ids)
+                    raise
+
+                # Advance only once the cycle's rows are durable; a failed
+                # commit re-reads the same rounds next cycle
+                _last_processed_round = new_round
+                if persist_round:
+                    _persisted_round = new_round
+                    _last_persist_mono = now
+
+                for app_id, token in token_updates.items():
+                    if token:
+                        _next_tokens[app_id] = token
+                    else:
+                        _next_tokens.pop(app_id, None)
+
+                # Pass 4 — hand new tips to the mint workers (rows are
+                # committed, so a worker or the retry task can always reload them)
+                await asyncio.gather(*[mint_worker.enqueue(tx_id) for tx_id in new_tx_ids])
+                new_tip_count = len(new_tx_ids)
+
+                # Phase 7: Metrics + listener lag (current round comes from
+                # the algod block wait at the top of the cycle)
                 m = get_listener_metrics()
                 m.set_last_round(_last_processed_round)
                 m.heartbeat()
-                try:
-                    async with httpx.AsyncClient(timeout=5.0) as client:
-                        r = await client.get(f"{settings.algorand_algod_address}/v2/status")
-                        if r.status_code == 200:
-                            data = r.json()
-                            m.current_round = data.get("last-round")
-                except Exception:
-                    pass
 
                 if new_tip_count > 0:
                     logger.info(
-                        f"  Listener processed {new_tip_count} new tip(s) "
+                        f"  Listener queued {new_tip_count} new tip(s) "
                         f"(round -> {_last_processed_round})"
                     )
+                    empty_cycles = 0
+                    wait_ceiling = min(_MIN_POLL_SECONDS, poll_interval)
+                else:
+                    empty_cycles += 1
+                    wait_ceiling = min(
+                        poll_interval, _MIN_POLL_SECONDS * 2 ** min(empty_cycles, 5)
+                    )
 
         except asyncio.CancelledError:
             logger.info("Listener cancelled")
@@ -885,8 +1299,10 @@ async def _listener_loop():
             if _errors_count > 5:
                 backoff = min(60, poll_interval * 2)
                 logger.warning(f"  Too many errors, backing off {backoff}s")
-                await asyncio.sleep(backoff)
+                if await _wait_for_stop(backoff):
+                    break
 
+    await _flush_last_round()
     _is_running = False
     logger.info("Listener stopped")
 
@@ -898,13 +1314,16 @@ async def _listener_loop():
 
 async def start():
     """Start the listener and retry task as background asyncio tasks."""
-    global _listener_task, _retry_task, _is_running
+    global _listener_task, _retry_task, _is_running, _stop_event
     _is_running = True
 
     if _listener_task and not _listener_task.done():
         logger.warning("Listener already running")
         return
 
+    _stop_event = asyncio.Event()
+    _get_http_client()
+
     _listener_task = asyncio.create_task(_listener_loop())
     _retry_task = asyncio.create_task(_retry_failed_mints())
     logger.info("Listener + retry tasks created")
@@ -912,11 +1331,18 @@ async def start():
 
 async def stop():
     """Stop the listener and retry task gracefully."""
-    global _listener_task, _retry_task, _is_running
+    global _listener_task, _retry_task, _is_running, _http_client
     _is_running = False
 
-    for task in [_listener_task, _retry_task]:
-        if task and not task.done():
+    # Wake the loops so an in-flight cycle commits and they exit on their
+    # own; only cancel what is still running after the grace period.
+    if _stop_event is not None:
+        _stop_event.set()
+
+    tasks = [t for t in (_listener_task, _retry_task) if t and not t.done()]
+    if tasks:
+        _, still_running = await asyncio.wait(tasks, timeout=_STOP_GRACE_SECONDS)
+        for task in still_running:
             task.cancel()
             try:
                 await task
@@ -925,6 +1351,11 @@ async def stop():
 
     _listener_task = None
     _retry_task = None
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
     logger.info("Listener + retry tasks stopped")
 
 
@@ -934,7 +1365,9 @@ def get_status() -> dict:
         "running": _is_running,
         "lastProcessedRound": _last_processed_round,
         "errorsCount": _errors_count,
+        # Upper bound between cycles: a new algod block triggers one sooner
         "pollIntervalSeconds": settings.listener_poll_seconds,
+        "pollMode": "wait-for-block",
         "retryEnabled": True,
         "maxRetryAttempts": MAX_RETRY_ATTEMPTS,
     }
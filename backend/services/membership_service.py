@@ -7,6 +7,7 @@ purchase membership stickers. Each tier has:
   - Expiry duration (in days)
   - Category matching a sticker template
 """
+import re
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -29,11 +30,33 @@ MEMBERSHIP_TIERS = {
 }
 
 
+# Known tier prefixes as one alternation (longest first), matched against
+# the stripped, upper-cased memo. Same semantics as startswith(key).
+_MEMBERSHIP_RE = re.compile(
+    "^(?:" + "|".join(re.escape(k) for k in sorted(MEMBERSHIP_TIERS, key=len, reverse=True)) + ")"
+)
+
+
+def parse(memo: str) -> Optional[tuple[dict, str]]:
+    """
+    Parse a membership memo in one pass.
+
+    Returns:
+        (tier dict, tier name e.g. "Bronze"), or None if the memo is not a
+        purchase of a known tier.
+    """
+    if not memo:
+        return None
+    m = _MEMBERSHIP_RE.match(memo.strip().upper())
+    if not m:
+        return None
+    key = m.group(0)
+    return MEMBERSHIP_TIERS[key], key.split(":", 1)[1].title()
+
+
 def is_membership_memo(memo: str) -> bool:
     """Check if a tip memo indicates a membership purchase."""
-    if not memo:
-        return False
-    return any(memo.strip().upper().startswith(k) for k in MEMBERSHIP_TIERS)
+    return bool(memo) and _MEMBERSHIP_RE.match(memo.strip().upper()) is not None
 
 
 def get_tier(memo: str) -> Optional[dict]:
@@ -42,26 +65,16 @@ def get_tier(memo: str) -> Optional[dict]:
 
     Returns tier dict {category, min_algo, expiry_days} or None.
     """
-    if not memo:
-        return None
-    memo_upper = memo.strip().upper()
-    for key, tier in MEMBERSHIP_TIERS.items():
-        if memo_upper.startswith(key):
-            return tier
-    return None
+    parsed = parse(memo)
+    return parsed[0] if parsed else None
 
 
-def calculate_expiry(tier: dict) -> datetime:
-    """Calculate expiry datetime from a tier definition."""
-    return datetime.utcnow() + timedelta(days=tier["expiry_days"])
+def calculate_expiry(tier: dict, now: Optional[datetime] = None) -> datetime:
+    """Calculate expiry datetime from a tier definition (from `now`, default utcnow)."""
+    return (now or datetime.utcnow()) + timedelta(days=tier["expiry_days"])
 
 
 def get_tier_name(memo: str) -> Optional[str]:
     """Extract human-readable tier name from memo."""
-    if not memo:
-        return None
-    memo_upper = memo.strip().upper()
-    for key in MEMBERSHIP_TIERS:
-        if memo_upper.startswith(key):
-            return key.split(":")[1].title()  # "BRONZE" -> "Bronze"
-    return None
+    parsed = parse(memo)
+    return parsed[1] if parsed else None  # "BRONZE" -> "Bronze"
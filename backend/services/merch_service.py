@@ -5,14 +5,27 @@ This is an off-chain commerce layer that integrates with on-chain payments via T
 Payments are detected by the listener using memo prefixes (e.g., ORDER:<id>).
 """
 
-import json
+import time
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import case, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db_models import Product, DiscountRule, Order, OrderItem
 
+# Creators known (recently) to have no unconditional discount rule, i.e.
+# none without a Shawty or Bauni requirement: {creator_wallet: expires_at}.
+# Lets the plain-checkout quote skip the rules query. Callers that create
+# a rule clear it with invalidate_discount_rules() once the rule is
+# committed; other writers are picked up after the TTL.
+_NO_UNCONDITIONAL_RULES_TTL = 60.0
+_no_unconditional_rules: dict[str, float] = {}
+
+
+def invalidate_discount_rules(creator_wallet: str) -> None:
+    """Forget cached rule lookups for a creator (call after committing a rule)."""
+    _no_unconditional_rules.pop(creator_wallet, None)
+
 
 async def create_product(
     db: AsyncSession,
@@ -74,63 +87,85 @@ async def update_product(
     max_per_order: int | None = None,
     stock_quantity: int | None = None,
     active: bool | None = None,
+    now: datetime | None = None,
 ) -> Product:
-    """Update a product's fields. Only provided fields are updated."""
-    product = await get_product(db, product_id=product_id, creator_wallet=creator_wallet)
+    """
+    Update a product's fields. Only provided fields are updated.
+
+    One UPDATE ... RETURNING scoped to the creator; no row back means the
+    product doesn't exist or belongs to someone else.
+    """
+    changes = {
+        "slug": slug,
+        "name": name,
+        "description": description,
+        "image_ipfs_hash": image_ipfs_hash,
+        "price_algo": price_algo,
+        "max_per_order": max_per_order,
+        "stock_quantity": stock_quantity,
+        "active": active,
+    }
+    values = {k: v for k, v in changes.items() if v is not None}
+    values["updated_at"] = now or datetime.utcnow()
+
+    res = await db.execute(
+        update(Product)
+        .where(Product.id == product_id, Product.creator_wallet == creator_wallet)
+        .values(**values)
+        .returning(Product)
+    )
+    product = res.scalar_one_or_none()
     if not product:
         from domain.errors import NotFoundError
         raise NotFoundError("Product", str(product_id))
-
-    if slug is not None:
-        product.slug = slug
-    if name is not None:
-        product.name = name
-    if description is not None:
-        product.description = description
-    if image_ipfs_hash is not None:
-        product.image_ipfs_hash = image_ipfs_hash
-    if price_algo is not None:
-        product.price_algo = price_algo
-    if max_per_order is not None:
-        product.max_per_order = max_per_order
-    if stock_quantity is not None:
-        product.stock_quantity = stock_quantity
-    if active is not None:
-        product.active = active
-
-    product.updated_at = datetime.utcnow()
-    await db.flush()
     return product
 
 
-async def soft_delete_product(db: AsyncSession, *, product_id: int, creator_wallet: str) -> Product:
-    """Soft-delete a product by setting active=False."""
-    product = await get_product(db, product_id=product_id, creator_wallet=creator_wallet)
-    if not product:
-        from domain.errors import NotFoundError
-        raise NotFoundError("Product", str(product_id))
+async def soft_delete_product(
+    db: AsyncSession, *, product_id: int, creator_wallet: str, now: datetime | None = None
+) -> Product:
+    """
+    Soft-delete a product by setting active=False.
 
-    # Check if product has pending orders
-    from db_models import OrderItem, Order
-    items_res = await db.execute(
-        select(OrderItem)
+    The pending-order guard is part of the UPDATE's WHERE clause, so the
+    common case is one round-trip; only a refusal re-reads the product to
+    tell "not found" from "has pending orders".
+    """
+    pending_items = (
+        select(OrderItem.id)
         .join(Order, OrderItem.order_id == Order.id)
         .where(
             OrderItem.product_id == product_id,
             Order.status == "PENDING_PAYMENT",
         )
     )
-    pending_items = items_res.scalars().all()
-    if pending_items:
-        from domain.errors import ConflictError
-        raise ConflictError(
-            f"Cannot delete product {product.slug}: {len(pending_items)} pending order(s) exist"
+    res = await db.execute(
+        update(Product)
+        .where(
+            Product.id == product_id,
+            Product.creator_wallet == creator_wallet,
+            ~pending_items.exists(),
         )
+        .values(active=False, updated_at=now or datetime.utcnow())
+        .returning(Product)
+    )
+    product = res.scalar_one_or_none()
+    if product:
+        return product
 
-    product.active = False
-    product.updated_at = datetime.utcnow()
-    await db.flush()
-    return product
+    product = await get_product(db, product_id=product_id, creator_wallet=creator_wallet)
+    if not product:
+        from domain.errors import NotFoundError
+        raise NotFoundError("Product", str(product_id))
+
+    # Check if product has pending orders
+    pending_count = await db.scalar(
+        select(func.count()).select_from(pending_items.subquery())
+    )
+    from domain.errors import ConflictError
+    raise ConflictError(
+        f"Cannot delete product {product.slug}: {pending_count} pending order(s) exist"
+    )
 
 
 async def list_store_products(db: AsyncSession, *, creator_wallet: str, limit: int = 50, offset: int = 0) -> list[Product]:
@@ -202,11 +237,20 @@ async def build_quote(
         if not m["is_valid"]:
             return {"success": False, "error": "Active Bauni membership required"}
 
+    # Only the columns the quote reads, as plain rows (no ORM hydration)
     product_ids = [int(i["product_id"]) for i in items]
     res = await db.execute(
-        select(Product).where(Product.creator_wallet == creator_wallet, Product.id.in_(product_ids))
+        select(
+            Product.id,
+            Product.slug,
+            Product.name,
+            Product.price_algo,
+            Product.stock_quantity,
+            Product.max_per_order,
+            Product.active,
+        ).where(Product.creator_wallet == creator_wallet, Product.id.in_(product_ids))
     )
-    products = {p.id: p for p in res.scalars().all()}
+    products = {p.id: p for p in res.all()}
 
     subtotal = 0.0
     normalized_items: list[dict] = []
@@ -233,37 +277,65 @@ async def build_quote(
     if shawty_asset_ids:
         from services import shawty_service
 
+        ownership = await shawty_service.validate_ownership_many(
+            db, [int(aid) for aid in shawty_asset_ids], fan_wallet
+        )
         for aid in shawty_asset_ids:
-            v = await shawty_service.validate_ownership(db, int(aid), fan_wallet)
-            if not v["is_valid"]:
+            if not ownership[int(aid)]["is_valid"]:
                 return {"success": False, "error": f"Invalid Shawty token for discount: {aid}"}
 
-    # Apply best matching discount rule
-    rules_res = await db.execute(
-        select(DiscountRule).where(
-            DiscountRule.creator_wallet == creator_wallet,
-            DiscountRule.active == True,
-        )
-    )
-    rules = rules_res.scalars().all()
-
     discount = 0.0
     applied_rule_id = None
-    for r in rules:
-        if r.requires_bauni and not require_membership:
-            continue
-        if len(shawty_asset_ids) < (r.min_shawty_tokens or 0):
-            continue
-        if r.discount_type == "PERCENT":
-            d = subtotal * (max(0.0, r.value) / 100.0)
-        elif r.discount_type == "FIXED_ALGO":
-            d = max(0.0, r.value)
-        else:
-            continue
-        if d > discount:
-            discount = d
-            applied_rule_id = r.id
 
+    # Common case: no Shawty tokens, no membership, and the creator has no
+    # unconditional rule, so no rule can apply — skip the query
+    unconditional_only = not shawty_asset_ids and not require_membership
+    if unconditional_only:
+        expires_at = _no_unconditional_rules.get(creator_wallet)
+        if expires_at is not None and time.monotonic() < expires_at:
+            return _quote(subtotal, discount, normalized_items, shawty_asset_ids, applied_rule_id)
+
+    # Apply best matching discount rule: eligibility and each rule's
+    # discount are computed in SQL, only the winning (id, amount) comes back
+    value = case((DiscountRule.value > 0, DiscountRule.value), else_=0.0)
+    rule_discount = case(
+        (DiscountRule.discount_type == "PERCENT", subtotal * (value / 100.0)),
+        else_=value,
+    ).label("discount")
+    conditions = [
+        DiscountRule.creator_wallet == creator_wallet,
+        DiscountRule.active == True,
+        DiscountRule.discount_type.in_(("PERCENT", "FIXED_ALGO")),
+        func.coalesce(DiscountRule.min_shawty_tokens, 0) <= len(shawty_asset_ids),
+    ]
+    if not require_membership:
+        conditions.append(DiscountRule.requires_bauni == False)
+    best_res = await db.execute(
+        select(DiscountRule.id, rule_discount)
+        .where(*conditions)
+        .order_by(rule_discount.desc(), DiscountRule.id)
+        .limit(1)
+    )
+    best = best_res.first()
+
+    if best is None:
+        if unconditional_only:
+            _no_unconditional_rules[creator_wallet] = time.monotonic() + _NO_UNCONDITIONAL_RULES_TTL
+    elif best.discount > 0:
+        discount = best.discount
+        applied_rule_id = best.id
+
+    return _quote(subtotal, discount, normalized_items, shawty_asset_ids, applied_rule_id)
+
+
+def _quote(
+    subtotal: float,
+    discount: float,
+    items: list[dict],
+    shawty_asset_ids: list[int],
+    applied_rule_id: int | None,
+) -> dict:
+    """Assemble build_quote's success payload."""
     discount = min(discount, subtotal)
     total = max(0.0, subtotal - discount)
 
@@ -272,7 +344,7 @@ async def build_quote(
         "subtotal_algo": round(subtotal, 6),
         "discount_algo": round(discount, 6),
         "total_algo": round(total, 6),
-        "items": normalized_items,
+        "items": items,
         "shawty_asset_ids_used": shawty_asset_ids,
         "applied_discount_rule_id": applied_rule_id,
     }
@@ -284,6 +356,7 @@ async def create_order(
     fan_wallet: str,
     creator_wallet: str,
     quote: dict,
+    now: datetime | None = None,
 ) -> Order:
     order = Order(
         fan_wallet=fan_wallet,
@@ -292,8 +365,8 @@ async def create_order(
         subtotal_algo=quote["subtotal_algo"],
         discount_algo=quote["discount_algo"],
         total_algo=quote["total_algo"],
-        shawty_asset_ids_used=json.dumps(quote.get("shawty_asset_ids_used") or []),
-        created_at=datetime.utcnow(),
+        shawty_asset_ids_used=quote.get("shawty_asset_ids_used") or [],
+        created_at=now or datetime.utcnow(),
     )
     db.add(order)
     await db.flush()
@@ -320,6 +393,7 @@ async def settle_order_payment(
     creator_wallet: str,
     amount_algo: float,
     tx_id: str,
+    now: datetime | None = None,
 ) -> bool:
     """
     Mark an order as paid when a TipProxy payment with memo ORDER:<id> is detected.
@@ -349,42 +423,30 @@ async def settle_order_payment(
 
     order.status = "PAID"
     order.tx_id = tx_id
-    order.paid_at = datetime.utcnow()
+    order.paid_at = now or datetime.utcnow()
 
-    # Adjust inventory
+    # Adjust inventory (items and their products in one joined SELECT)
     items_res = await db.execute(
-        select(OrderItem).where(OrderItem.order_id == order.id)
+        select(OrderItem.quantity, Product)
+        .join(Product, Product.id == OrderItem.product_id)
+        .where(OrderItem.order_id == order.id)
     )
-    items = items_res.scalars().all()
-    if items:
-        product_ids = [i.product_id for i in items]
-        products_res = await db.execute(
-            select(Product).where(Product.id.in_(product_ids))
-        )
-        products = {p.id: p for p in products_res.scalars().all()}
-        for it in items:
-            p = products.get(it.product_id)
-            if p and p.stock_quantity is not None:
-                if p.stock_quantity >= it.quantity:
-                    p.stock_quantity -= it.quantity
+    for quantity, p in items_res.all():
+        if p.stock_quantity is not None:
+            if p.stock_quantity >= quantity:
+                p.stock_quantity -= quantity
 
     # Consume Shawty tokens used for discount by locking them
-    try:
-        asset_ids = json.loads(order.shawty_asset_ids_used or "[]")
-    except Exception:
-        asset_ids = []
-
+    asset_ids = order.shawty_asset_ids_used or []
     if asset_ids:
         from services import shawty_service
 
-        for aid in asset_ids:
-            desc = f"Discount for merch order {order.id}"
-            await shawty_service.lock_for_discount(
-                db=db,
-                asset_id=int(aid),
-                fan_wallet=fan_wallet,
-                discount_description=desc,
-            )
+        await shawty_service.lock_many_for_discount(
+            db=db,
+            asset_ids=[int(aid) for aid in asset_ids],
+            fan_wallet=fan_wallet,
+            discount_description=f"Discount for merch order {order.id}",
+        )
 
     return True
 
@@ -0,0 +1,154 @@
+"""
+Mint worker — runs the NFT minting pipeline off the listener's poll loop.
+
+Phase 7 TODO #1: the listener used to `await route_tip()` inline, so every
+mint (~4.5s of algod round-trips) stalled polling for all contracts.
+The listener now only records Transaction rows and enqueues their tx_ids
+here; a small pool of worker tasks drains the queue independently.
+
+Jobs carry only the on-chain tx_id. Each worker opens its own session,
+reloads the row, runs route_tip() and marks it processed. A failed job
+leaves processed=False, so the listener's retry task (Fix #4) remains the
+durable dead-letter path — nothing is lost if the process stops with jobs
+still queued.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import select
+
+from config import settings
+from database import async_session
+from db_models import Transaction
+# listener_service imports this module too; only its attributes are looked
+# up at call time, so the import cycle resolves either way round.
+from services import listener_service
+from services.listener_metrics import get_listener_metrics
+
+logger = logging.getLogger(__name__)
+
+_queue: Optional[asyncio.Queue] = None
+_workers: list[asyncio.Task] = []
+
+# tx_ids that are queued or being minted right now.
+# The retry task skips these so a tip is never routed twice concurrently.
+_pending: set[str] = set()
+
+
+async def mint_tip(tx_id: str) -> None:
+    """
+    Run the minting pipeline for one recorded tip.
+
+    Args:
+        tx_id: Algorand transaction ID of the tip (Transaction.tx_id)
+    """
+    async with async_session() as db:
+        result = await db.execute(select(Transaction).where(Transaction.tx_id == tx_id))
+        tx_record = result.scalar_one_or_none()
+        if tx_record is None or tx_record.processed:
+            return
+
+        try:
+            await listener_service.route_tip(tx_record, db)
+            tx_record.processed = True
+            await db.commit()
+            get_listener_metrics().record_tip_processed()
+        except Exception as e:
+            await db.rollback()
+            get_listener_metrics().record_mint_failed()
+            logger.error(f"Minting pipeline error for tx {tx_id}: {e}")
+            # Leave processed=False for retry task.
+
+
+async def _worker(worker_num: int):
+    """Drain mint jobs until cancelled."""
+    while True:
+        tx_id = await _queue.get()
+        try:
+            await mint_tip(tx_id)
+        except Exception as e:
+            logger.error(f"Mint worker {worker_num} error on tx {tx_id}: {e}")
+        finally:
+            _pending.discard(tx_id)
+            _queue.task_done()
+
+
+async def enqueue(tx_id: str) -> None:
+    """
+    Queue a recorded tip for minting.
+
+    The queue is bounded (settings.max_inflight_mints): when it is full this
+    waits for a worker to free a slot, pushing back on the listener.
+    """
+    if _queue is None:
+        # Workers not running (e.g. startup failed) — retry task will pick it up
+        return
+    _pending.add(tx_id)
+    await _queue.put(tx_id)
+
+
+def reserve(tx_ids: list[str]) -> None:
+    """
+    Mark tips pending before the listener commits their rows.
+
+    Once committed the rows are visible to the retry task, so they must
+    already count as pending or it would route them alongside a worker.
+    """
+    if _queue is None:
+        return
+    _pending.update(tx_ids)
+
+
+def release(tx_ids: list[str]) -> None:
+    """Undo reserve() for tips whose rows were never committed."""
+    _pending.difference_update(tx_ids)
+
+
+def is_pending(tx_id: str) -> bool:
+    """True if the tip is queued or currently being minted."""
+    return tx_id in _pending
+
+
+def queue_depth() -> int:
+    """Number of mint jobs waiting for a worker."""
+    return _queue.qsize() if _queue is not None else 0
+
+
+def is_saturated() -> bool:
+    """True if queued + in-flight mints have reached settings.max_inflight_mints."""
+    return len(_pending) >= settings.max_inflight_mints
+
+
+async def start(worker_count: Optional[int] = None):
+    """Start the mint worker tasks (default: settings.mint_worker_count)."""
+    global _queue, _workers
+
+    if worker_count is None:
+        worker_count = settings.mint_worker_count
+
+    if _workers:
+        logger.warning("Mint workers already running")
+        return
+
+    _queue = asyncio.Queue(maxsize=settings.max_inflight_mints)
+    _workers = [asyncio.create_task(_worker(i)) for i in range(worker_count)]
+    logger.info(f"Mint workers started ({worker_count} workers)")
+
+
+async def stop():
+    """Cancel the mint workers. Queued jobs stay processed=False for retry."""
+    global _queue, _workers
+
+    for task in _workers:
+        task.cancel()
+    for task in _workers:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    _workers = []
+    _queue = None
+    _pending.clear()
+    logger.info("Mint workers stopped")
@@ -13,32 +13,42 @@ Flow:
 
 Phase 7: Async wrappers run blocking algod calls in thread pool to avoid blocking event loop.
 """
+import asyncio
 import logging
-from typing import Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 from algosdk import account
 
 from algorand_client import algorand_client
 from config import settings
 from services.async_executor import run_blocking
+from services.listener_metrics import get_listener_metrics
 from sticker_scripts.mint_soulbound import mint_soulbound
 from sticker_scripts.mint_golden import mint_golden
-from sticker_scripts.optin_asset import optin_asset
 from sticker_scripts.transfer_nft import transfer_nft
+from sticker_scripts.utils import get_cached_params
 
 logger = logging.getLogger(__name__)
 
+# Caps concurrent mint+send pipelines across mint workers and the retry
+# task, so catch-up bursts queue here instead of piling onto algod.
+_mint_semaphore = asyncio.Semaphore(settings.mint_worker_count)
 
-def _get_platform_account() -> dict:
+
+@lru_cache(maxsize=1)
+def _get_platform_account() -> Mapping[str, str]:
     """
     Get the platform wallet's private key and address.
 
     Security fix H4: Uses settings.platform_private_key (cached)
-    instead of re-deriving from mnemonic on every call.
+    instead of re-deriving from mnemonic on every call. The address is
+    derived once per process too (read-only mapping, shared by callers).
     """
     private_key = settings.platform_private_key  # Cached in config.py
     address = account.address_from_private_key(private_key)
-    return {"address": address, "private_key": private_key}
+    return MappingProxyType({"address": address, "private_key": private_key})
 
 
 async def mint_soulbound_sticker_async(
@@ -275,16 +285,13 @@ def send_nft_to_fan(
     Returns:
         dict: {status: 'delivered'|'pending_optin', tx_id: str|None}
     """
-    from algosdk import transaction as algo_txn
-
     platform = _get_platform_account()
     client = algorand_client.client
 
     logger.info(f"Transferring NFT {asset_id} to {fan_wallet[:8]}...")
 
     # Check if the asset is frozen (soulbound)
-    asset_info = client.asset_info(asset_id)
-    is_frozen = asset_info.get("params", {}).get("default-frozen", False)
+    is_frozen = _is_default_frozen(asset_id)
 
     # Check if fan has opted in
     fan_info = client.account_info(fan_wallet)
@@ -294,14 +301,12 @@ def send_nft_to_fan(
 
     if not fan_opted_in:
         if fan_private_key:
-            # Auto opt-in if we have the fan's key (demo/testing mode ONLY)
-            optin_asset(
-                client=client,
-                account_address=fan_wallet,
-                account_private_key=fan_private_key,
-                asset_id=asset_id,
+            # Auto opt-in if we have the fan's key (demo/testing mode ONLY),
+            # grouped with the transfer so both confirm in one wait
+            tx_id = _optin_and_transfer_to_fan(
+                client, platform, asset_id, fan_wallet, fan_private_key, is_frozen
             )
-            logger.info(f"  Auto opt-in completed for {fan_wallet[:8]}... (demo mode)")
+            return {"status": "delivered", "tx_id": tx_id}
         else:
             # Production mode: fan must opt-in via Pera Wallet first
             logger.info(
@@ -310,9 +315,30 @@ def send_nft_to_fan(
             )
             return {"status": "pending_optin", "tx_id": None}
 
+    tx_id = _transfer_to_fan(client, platform, asset_id, fan_wallet, is_frozen)
+    return {"status": "delivered", "tx_id": tx_id}
+
+
+@lru_cache(maxsize=1024)
+def _is_default_frozen(asset_id: int) -> bool:
+    """
+    An ASA's default-frozen flag (cached per asset).
+
+    default-frozen is fixed at creation and can never be reconfigured, so
+    one asset_info lookup per asset serves every later transfer. The fan's
+    opt-in state is not cached: it changes when the fan opts in to claim.
+    """
+    asset_info = algorand_client.client.asset_info(asset_id)
+    return asset_info.get("params", {}).get("default-frozen", False)
+
+
+def _transfer_to_fan(client, platform: dict, asset_id: int, fan_wallet: str, is_frozen: bool) -> str:
+    """Move one unit of the NFT from the platform wallet to an opted-in fan."""
+    from algosdk import transaction as algo_txn
+
     if is_frozen:
         # Soulbound: use clawback transfer (platform is clawback authority)
-        sp = client.suggested_params()
+        sp = get_cached_params(client)
         sp.fee = max(sp.fee, 1000)
         sp.flat_fee = True
 
@@ -342,9 +368,167 @@ def send_nft_to_fan(
         )
         logger.info(f"  Golden NFT {asset_id} transferred — TX: {tx_id}")
 
+    return tx_id
+
+
+def _optin_and_transfer_to_fan(
+    client,
+    platform: Mapping[str, str],
+    asset_id: int,
+    fan_wallet: str,
+    fan_private_key: str,
+    is_frozen: bool,
+) -> str:
+    """
+    Demo mode: opt the fan in and deliver the NFT as one atomic group.
+
+    The fan's opt-in and the platform's transfer (clawback for soulbound)
+    share suggested params, go out in a single send and confirm with a
+    single wait, instead of two sequential send + 4-round waits. Atomic,
+    too: the fan is never left opted in without the NFT.
+
+    Returns:
+        str: transfer transaction ID
+    """
+    from algosdk import transaction as algo_txn
+
+    sp = get_cached_params(client)
+    sp.fee = max(sp.fee, 1000)
+    sp.flat_fee = True
+
+    optin_txn = algo_txn.AssetTransferTxn(
+        sender=fan_wallet, sp=sp, receiver=fan_wallet, amt=0, index=asset_id,
+    )
+    xfer_txn = algo_txn.AssetTransferTxn(
+        sender=platform["address"],
+        sp=sp,
+        receiver=fan_wallet,
+        amt=1,
+        index=asset_id,
+        # Soulbound: platform is clawback authority, revoking from itself
+        revocation_target=platform["address"] if is_frozen else None,
+    )
+    algo_txn.assign_group_id([optin_txn, xfer_txn])
+
+    client.send_transactions([
+        optin_txn.sign(fan_private_key),
+        xfer_txn.sign(platform["private_key"]),
+    ])
+    tx_id = xfer_txn.get_txid()
+    algo_txn.wait_for_confirmation(client, tx_id, 4)
+
+    kind = "Soulbound" if is_frozen else "Golden"
+    logger.info(
+        f"  {kind} NFT {asset_id} opted in + transferred to {fan_wallet[:8]}... "
+        f"(demo mode, grouped) — TX: {tx_id}"
+    )
+    return tx_id
+
+
+async def send_new_nft_to_fan_async(
+    asset_id: int,
+    fan_wallet: str,
+    default_frozen: bool,
+    fan_private_key: Optional[str] = None,
+) -> dict:
+    """
+    Async wrapper: runs blocking transfer in thread pool (Phase 7).
+    """
+    return await run_blocking(
+        send_new_nft_to_fan,
+        asset_id=asset_id,
+        fan_wallet=fan_wallet,
+        default_frozen=default_frozen,
+        fan_private_key=fan_private_key,
+    )
+
+
+def send_new_nft_to_fan(
+    asset_id: int,
+    fan_wallet: str,
+    default_frozen: bool,
+    fan_private_key: Optional[str] = None,
+) -> dict:
+    """
+    Transfer an NFT the platform has just minted to a fan.
+
+    Same outcome as send_nft_to_fan(), minus its two algod lookups: the
+    caller knows default_frozen from the mint, and nobody can have opted
+    in to an asset that did not exist a moment ago.
+
+    Args:
+        asset_id: Algorand ASA ID (freshly minted)
+        fan_wallet: Recipient's Algorand address
+        default_frozen: True for soulbound, False for golden
+        fan_private_key: Demo mode only — used for auto opt-in
+
+    Returns:
+        dict: {status: 'delivered'|'pending_optin', tx_id: str|None}
+    """
+    if not fan_private_key:
+        logger.info(
+            f"  Fan {fan_wallet[:8]}... not opted in to new ASA {asset_id}. "
+            f"NFT saved as pending — fan can claim via frontend."
+        )
+        return {"status": "pending_optin", "tx_id": None}
+
+    platform = _get_platform_account()
+    client = algorand_client.client
+
+    logger.info(f"Transferring new NFT {asset_id} to {fan_wallet[:8]}...")
+    tx_id = _optin_and_transfer_to_fan(
+        client, platform, asset_id, fan_wallet, fan_private_key, default_frozen
+    )
     return {"status": "delivered", "tx_id": tx_id}
 
 
+async def mint_and_send_async(
+    name: str,
+    metadata_url: str,
+    sticker_type: str,
+    unit_name: str,
+    fan_wallet: str,
+    fan_private_key: Optional[str] = None,
+) -> tuple[int, dict]:
+    """
+    Mint a sticker NFT and deliver it to a fan (listener pipeline).
+
+    A mint failure raises. A transfer failure does not: the asset exists,
+    so it is reported as status 'failed' for the caller to record.
+
+    Args:
+        name: ASA name
+        metadata_url: IPFS metadata URL
+        sticker_type: 'soulbound' or 'golden'
+        unit_name: ASA unit name
+        fan_wallet: Recipient's Algorand address
+        fan_private_key: Demo mode only — used for auto opt-in
+
+    Returns:
+        tuple: (asset_id, {status: 'delivered'|'pending_optin'|'failed', tx_id: str|None})
+    """
+    golden = sticker_type == "golden"
+    mint = mint_golden_sticker_async if golden else mint_soulbound_sticker_async
+    metrics = get_listener_metrics()
+
+    async with _mint_semaphore:
+        metrics.mint_started()
+        try:
+            asset_id = await mint(name=name, metadata_url=metadata_url, unit_name=unit_name)
+
+            try:
+                xfer = await send_new_nft_to_fan_async(
+                    asset_id, fan_wallet, default_frozen=not golden, fan_private_key=fan_private_key
+                )
+            except Exception as e:
+                logger.warning(f"NFT {asset_id} transfer failed: {e}")
+                xfer = {"status": "failed", "tx_id": None}
+        finally:
+            metrics.mint_finished()
+
+    return asset_id, xfer
+
+
 def create_optin_txn(asset_id: int, fan_wallet: str) -> dict:
     """
     Create an unsigned ASA opt-in transaction for a fan.
@@ -362,7 +546,7 @@ def create_optin_txn(asset_id: int, fan_wallet: str) -> dict:
     from algosdk import transaction, encoding
 
     client = algorand_client.client
-    sp = client.suggested_params()
+    sp = get_cached_params(client)
     sp.fee = max(sp.fee, 1000)
     sp.flat_fee = True
 
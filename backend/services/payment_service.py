@@ -9,6 +9,7 @@ from __future__ import annotations
 from algosdk import transaction
 
 from algorand_client import algorand_client
+from services.async_executor import run_blocking
 
 
 def send_payment(
@@ -33,3 +34,24 @@ def send_payment(
     transaction.wait_for_confirmation(client, tx_id, 4)
     return tx_id
 
+
+async def send_payment_async(
+    *,
+    sender_address: str,
+    sender_private_key: str,
+    receiver_address: str,
+    amount_micro: int,
+    note: bytes | None = None,
+) -> str:
+    """
+    Async wrapper: runs the blocking send + confirmation wait in the thread
+    pool, so async routes don't stall the event loop for up to 4 rounds.
+    """
+    return await run_blocking(
+        send_payment,
+        sender_address=sender_address,
+        sender_private_key=sender_private_key,
+        receiver_address=receiver_address,
+        amount_micro=amount_micro,
+        note=note,
+    )
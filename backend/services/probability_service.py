@@ -9,6 +9,7 @@ Configuration (from .env):
     GOLDEN_THRESHOLD       — Base probability (default 0.10 = 10%)
     GOLDEN_TRIGGER_INTERVAL — Guaranteed golden every N tips (default 10)
 """
+import bisect
 import logging
 import random
 from typing import Optional
@@ -17,8 +18,35 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
-# Seed the RNG for reproducibility in tests (can be overridden)
+# Seed the RNG for reproducibility in tests (can be overridden via _rng.seed)
 _rng = random.Random()
+_rand = _rng.random  # bound once; skips the attribute lookup per roll
+
+# Whale bonus: tips at or above each threshold get the matching bonus
+_BONUS_THRESHOLDS = (5.0, 10.0, 50.0)
+_BONUS_VALUES = (0.0, 0.05, 0.10, 0.20)
+
+
+# Cap at 80% — guaranteed triggers handle the rest
+_MAX_PROBABILITY = 0.80
+
+# Capped golden probability per bonus bucket for the configured threshold
+_PROB_TABLE: tuple[float, ...] = ()
+
+
+def _rebuild_table() -> None:
+    """Recompute _PROB_TABLE; call again if settings.golden_threshold changes."""
+    global _PROB_TABLE
+    base = settings.golden_threshold
+    _PROB_TABLE = tuple(min(base + bonus, _MAX_PROBABILITY) for bonus in _BONUS_VALUES)
+
+
+_rebuild_table()
+
+
+def _bonus_bucket(amount_algo: float) -> int:
+    """Index into _BONUS_VALUES / _PROB_TABLE for a tip of amount_algo ALGO."""
+    return bisect.bisect_right(_BONUS_THRESHOLDS, amount_algo)
 
 
 def should_mint_golden(
@@ -46,43 +74,36 @@ def should_mint_golden(
     Returns:
         True if this tip should trigger a golden sticker mint
     """
-    base_probability = override_probability if override_probability is not None else settings.golden_threshold
     trigger_interval = settings.golden_trigger_interval
 
     # Path 1: Guaranteed trigger every N tips
     if trigger_interval > 0 and tip_count > 0 and tip_count % trigger_interval == 0:
         logger.info(
-            f"  🌟 Golden sticker GUARANTEED — tip #{tip_count} "
-            f"(every {trigger_interval} tips)"
+            "  🌟 Golden sticker GUARANTEED — tip #%d (every %d tips)",
+            tip_count, trigger_interval,
         )
         return True
 
     # Path 2: Random chance with tip-amount bonus
-    probability = base_probability
-
     # Whale bonus — bigger tips get higher golden chance
-    if amount_algo >= 50.0:
-        probability += 0.20
-    elif amount_algo >= 10.0:
-        probability += 0.10
-    elif amount_algo >= 5.0:
-        probability += 0.05
-
-    # Cap at 80% — guaranteed triggers handle the rest
-    probability = min(probability, 0.80)
+    bucket = _bonus_bucket(amount_algo)
+    if override_probability is None:
+        probability = _PROB_TABLE[bucket]
+    else:
+        probability = min(override_probability + _BONUS_VALUES[bucket], _MAX_PROBABILITY)
 
-    roll = _rng.random()
+    roll = _rand()
     is_golden = roll < probability
 
     if is_golden:
         logger.info(
-            f"  🌟 Golden sticker WON — roll={roll:.4f} < threshold={probability:.4f} "
-            f"(tip #{tip_count}, {amount_algo:.2f} ALGO)"
+            "  🌟 Golden sticker WON — roll=%.4f < threshold=%.4f (tip #%d, %.2f ALGO)",
+            roll, probability, tip_count, amount_algo,
         )
     else:
         logger.debug(
-            f"  Regular sticker — roll={roll:.4f} >= threshold={probability:.4f} "
-            f"(tip #{tip_count}, {amount_algo:.2f} ALGO)"
+            "  Regular sticker — roll=%.4f >= threshold=%.4f (tip #%d, %.2f ALGO)",
+            roll, probability, tip_count, amount_algo,
         )
 
     return is_golden
@@ -103,16 +124,9 @@ def get_golden_probability(
         dict with base_probability, bonus, total, trigger_interval
     """
     base = settings.golden_threshold
-    bonus = 0.0
-
-    if amount_algo >= 50.0:
-        bonus = 0.20
-    elif amount_algo >= 10.0:
-        bonus = 0.10
-    elif amount_algo >= 5.0:
-        bonus = 0.05
-
-    total = min(base + bonus, 0.80)
+    bucket = _bonus_bucket(amount_algo)
+    bonus = _BONUS_VALUES[bucket]
+    total = _PROB_TABLE[bucket]
 
     return {
         "baseProbability": base,
@@ -16,8 +16,11 @@ from datetime import datetime
 from typing import Optional
 
 from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from db_models import ShawtyToken, Redemption
+
 logger = logging.getLogger(__name__)
 
 # Constants
@@ -32,7 +35,7 @@ async def register_purchase(
     creator_wallet: str,
     purchase_tx_id: Optional[str] = None,
     amount_paid_micro: int = SHAWTY_COST_MICRO,
-) -> "ShawtyToken":
+) -> ShawtyToken:
     """
     Register a newly purchased Shawty token.
 
@@ -41,27 +44,30 @@ async def register_purchase(
     Returns:
         ShawtyToken: The created DB record.
     """
-    from db_models import ShawtyToken
-
-    if purchase_tx_id:
+    # One round-trip on the normal path; a replayed purchase_tx_id hits the
+    # unique constraint and falls back to reading the already-registered row
+    result = await db.execute(
+        sqlite_insert(ShawtyToken)
+        .values(
+            asset_id=asset_id,
+            owner_wallet=owner_wallet,
+            creator_wallet=creator_wallet,
+            purchase_tx_id=purchase_tx_id,
+            amount_paid_micro=amount_paid_micro,
+        )
+        .on_conflict_do_nothing(index_elements=["purchase_tx_id"])
+        .returning(ShawtyToken)
+    )
+    token = result.scalar_one_or_none()
+    if token is None:
         existing = await db.execute(
             select(ShawtyToken).where(ShawtyToken.purchase_tx_id == purchase_tx_id)
         )
-        token = existing.scalar_one_or_none()
-        if token:
-            return token
-
-    token = ShawtyToken(
-        asset_id=asset_id,
-        owner_wallet=owner_wallet,
-        creator_wallet=creator_wallet,
-        purchase_tx_id=purchase_tx_id,
-        amount_paid_micro=amount_paid_micro,
-    )
-    db.add(token)
+        return existing.scalar_one()
+
     logger.info(
-        f"Shawty: registered ASA {asset_id} for {owner_wallet[:8]}... "
-        f"(creator: {creator_wallet[:8]}...)"
+        "Shawty: registered ASA %d for %.8s... (creator: %.8s...)",
+        asset_id, owner_wallet, creator_wallet,
     )
     return token
 
@@ -89,19 +95,48 @@ async def burn_for_merch(
     Returns:
         dict: {success, redemption, error}
     """
-    from db_models import ShawtyToken, Redemption
-
     token = await _get_valid_token(db, asset_id, fan_wallet)
     if isinstance(token, dict):
         return token  # error dict
 
+    return _burn_token(db, token, fan_wallet, item_description)
+
+
+async def burn_many_for_merch(
+    db: AsyncSession,
+    asset_ids: list[int],
+    fan_wallet: str,
+    item_description: str,
+) -> list[dict]:
+    """
+    Burn several Shawty tokens for one redemption, loading them in one query.
+
+    Same per-token validation and result as burn_for_merch, in
+    asset_ids order (a repeated id fails as already burned).
+
+    Returns:
+        list of {success, redemption, error} dicts
+    """
+    tokens = await _get_tokens(db, asset_ids)
+    results = []
+    for asset_id in asset_ids:
+        token = _check_token(tokens.get(asset_id), asset_id, fan_wallet)
+        if isinstance(token, dict):
+            results.append(token)  # error dict
+        else:
+            results.append(_burn_token(db, token, fan_wallet, item_description))
+    return results
+
+
+def _burn_token(db: AsyncSession, token, fan_wallet: str, item_description: str) -> dict:
+    """Internal helper: burn a validated token and record the redemption."""
     # Mark as burned
     token.is_burned = True
     token.burned_at = datetime.utcnow()
 
     # Record redemption
     redemption = Redemption(
-        shawty_asset_id=asset_id,
+        shawty_asset_id=token.asset_id,
         fan_wallet=fan_wallet,
         redemption_type="burn_merch",
         description=item_description,
@@ -109,8 +144,8 @@ async def burn_for_merch(
     db.add(redemption)
 
     logger.info(
-        f"Shawty BURN: ASA {asset_id} by {fan_wallet[:8]}... "
-        f"for '{item_description}'"
+        "Shawty BURN: ASA %d by %.8s... for '%s'",
+        token.asset_id, fan_wallet, item_description,
     )
     return {"success": True, "redemption": redemption, "error": None}
 
@@ -134,19 +169,48 @@ async def lock_for_discount(
     Returns:
         dict: {success, redemption, error}
     """
-    from db_models import ShawtyToken, Redemption
-
     token = await _get_valid_token(db, asset_id, fan_wallet)
     if isinstance(token, dict):
         return token  # error dict
 
+    return _lock_token(db, token, fan_wallet, discount_description)
+
+
+async def lock_many_for_discount(
+    db: AsyncSession,
+    asset_ids: list[int],
+    fan_wallet: str,
+    discount_description: str,
+) -> list[dict]:
+    """
+    Lock several Shawty tokens for one discount, loading them in one query.
+
+    Same per-token validation and result as lock_for_discount, in
+    asset_ids order (a repeated id fails as already locked).
+
+    Returns:
+        list of {success, redemption, error} dicts
+    """
+    tokens = await _get_tokens(db, asset_ids)
+    results = []
+    for asset_id in asset_ids:
+        token = _check_token(tokens.get(asset_id), asset_id, fan_wallet)
+        if isinstance(token, dict):
+            results.append(token)  # error dict
+        else:
+            results.append(_lock_token(db, token, fan_wallet, discount_description))
+    return results
+
+
+def _lock_token(db: AsyncSession, token, fan_wallet: str, discount_description: str) -> dict:
+    """Internal helper: lock a validated token and record the redemption."""
     # Mark as locked
     token.is_locked = True
     token.locked_at = datetime.utcnow()
 
     # Record redemption
     redemption = Redemption(
-        shawty_asset_id=asset_id,
+        shawty_asset_id=token.asset_id,
         fan_wallet=fan_wallet,
         redemption_type="lock_discount",
         description=discount_description,
@@ -154,8 +218,8 @@ async def lock_for_discount(
     db.add(redemption)
 
     logger.info(
-        f"Shawty LOCK: ASA {asset_id} by {fan_wallet[:8]}... "
-        f"for '{discount_description}'"
+        "Shawty LOCK: ASA %d by %.8s... for '%s'",
+        token.asset_id, fan_wallet, discount_description,
     )
     return {"success": True, "redemption": redemption, "error": None}
 
@@ -175,16 +239,14 @@ async def transfer_ownership(
     Returns:
         dict: {success, error}
     """
-    from db_models import ShawtyToken
-
     token = await _get_valid_token(db, asset_id, from_wallet)
     if isinstance(token, dict):
         return token  # error dict
 
     token.owner_wallet = to_wallet
     logger.info(
-        f"Shawty TRANSFER: ASA {asset_id} "
-        f"{from_wallet[:8]}... -> {to_wallet[:8]}..."
+        "Shawty TRANSFER: ASA %d %.8s... -> %.8s...",
+        asset_id, from_wallet, to_wallet,
     )
     return {"success": True, "error": None}
 
@@ -200,13 +262,29 @@ async def validate_ownership(
     Returns:
         dict: {is_valid, is_burned, is_locked, token}
     """
-    from db_models import ShawtyToken
-
     result = await db.execute(
         select(ShawtyToken).where(ShawtyToken.asset_id == asset_id)
     )
-    token = result.scalar_one_or_none()
+    return _ownership(result.scalar_one_or_none(), fan_wallet)
+
+
+async def validate_ownership_many(
+    db: AsyncSession,
+    asset_ids: list[int],
+    fan_wallet: str,
+) -> dict[int, dict]:
+    """
+    Validate several Shawty tokens for one fan with a single IN query.
+
+    Returns:
+        dict: {asset_id: {is_valid, is_burned, is_locked, token}}
+    """
+    tokens = await _get_tokens(db, asset_ids)
+    return {aid: _ownership(tokens.get(aid), fan_wallet) for aid in asset_ids}
+
 
+def _ownership(token, fan_wallet: str) -> dict:
+    """Internal helper: validate_ownership's result for a loaded token (or None)."""
     if not token:
         return {"is_valid": False, "is_burned": False, "is_locked": False, "token": None}
 
@@ -224,8 +302,6 @@ async def get_fan_shawty_tokens(
     include_spent: bool = False,
 ) -> list:
     """Get all Shawty tokens owned by a fan."""
-    from db_models import ShawtyToken
-
     query = select(ShawtyToken).where(ShawtyToken.owner_wallet == fan_wallet)
     if not include_spent:
         query = query.where(
@@ -242,8 +318,6 @@ async def get_redemption_history(
     limit: int = 50,
 ) -> list:
     """Get all redemption events for a fan."""
-    from db_models import Redemption
-
     result = await db.execute(
         select(Redemption)
         .where(Redemption.fan_wallet == fan_wallet)
@@ -258,13 +332,27 @@ async def _get_valid_token(db: AsyncSession, asset_id: int, fan_wallet: str):
     Internal helper: get a token and validate ownership + state.
     Returns ShawtyToken on success, or error dict on failure.
     """
-    from db_models import ShawtyToken
-
     result = await db.execute(
         select(ShawtyToken).where(ShawtyToken.asset_id == asset_id)
     )
-    token = result.scalar_one_or_none()
+    return _check_token(result.scalar_one_or_none(), asset_id, fan_wallet)
+
 
+async def _get_tokens(db: AsyncSession, asset_ids: list[int]) -> dict:
+    """Internal helper: load ShawtyTokens for asset_ids in one query, keyed by asset_id."""
+    if not asset_ids:
+        return {}
+    result = await db.execute(
+        select(ShawtyToken).where(ShawtyToken.asset_id.in_(set(asset_ids)))
+    )
+    return {t.asset_id: t for t in result.scalars().all()}
+
+
+def _check_token(token, asset_id: int, fan_wallet: str):
+    """
+    Internal helper: validate a loaded token's ownership + state.
+    Returns the token on success, or error dict on failure.
+    """
     if not token:
         return {"success": False, "error": f"Shawty token ASA {asset_id} not found"}
 
@@ -1,12 +1,22 @@
 """
 Transaction service — handles base64 processing, submission, and error classification.
 """
+import asyncio
 import base64
+import binascii
 import hashlib
 import logging
+import re
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
 from algorand_client import algorand_client
+from db_models import SubmittedTransaction
+from services.async_executor import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -26,14 +36,56 @@ logger = logging.getLogger(__name__)
 
 _IDEMPOTENCY_TTL = timedelta(minutes=5)
 
-
-def _sha256_hex(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest()
+# In-process front for the submitted_transactions table: a retried key is
+# answered without a SELECT. key -> (tx_id, monotonic expiry); oldest
+# entries are dropped past _IDEMPOTENCY_CACHE_MAX.
+_IDEMPOTENCY_CACHE_MAX = 10_000
+_idempotency_cache: dict[str, tuple[str, float]] = {}
+
+# Per-key locks so concurrent retries of one key submit (and insert) once.
+# key -> [lock, holders + waiters]; an entry is dropped only when that
+# count reaches zero, so a waiter being handed the lock keeps it alive
+_idempotency_locks: dict[str, list] = {}
+
+
+def _request_hash(data: bytes) -> str:
+    # Only fingerprints a payload within the idempotency TTL (not a security
+    # boundary), so a 128-bit BLAKE2b digest is plenty and cheaper than SHA-256
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _idempotency_cache_put(key: str, tx_id: str, ttl_seconds: float) -> None:
+    _idempotency_cache.pop(key, None)
+    if len(_idempotency_cache) >= _IDEMPOTENCY_CACHE_MAX:
+        del _idempotency_cache[next(iter(_idempotency_cache))]
+    _idempotency_cache[key] = (tx_id, time.monotonic() + ttl_seconds)
+
+
+@asynccontextmanager
+async def _idempotency_guard(key: str | None):
+    """Serialize submissions sharing an idempotency key (no-op without one)."""
+    if not key:
+        yield
+        return
+    entry = _idempotency_locks.get(key)
+    if entry is None:
+        entry = _idempotency_locks[key] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _idempotency_locks[key]
 
 
 async def _idempotency_get_db(db, *, key: str) -> str | None:
-    from sqlalchemy import select, delete
-    from db_models import SubmittedTransaction
+    cached = _idempotency_cache.get(key)
+    if cached:
+        if time.monotonic() < cached[1]:
+            return cached[0]
+        del _idempotency_cache[key]
 
     now = datetime.utcnow()
     res = await db.execute(
@@ -45,6 +97,7 @@ async def _idempotency_get_db(db, *, key: str) -> str | None:
     if row.expires_at <= now:
         await db.execute(delete(SubmittedTransaction).where(SubmittedTransaction.id == row.id))
         return None
+    _idempotency_cache_put(key, row.tx_id, (row.expires_at - now).total_seconds())
     return row.tx_id
 
 
@@ -56,50 +109,68 @@ async def _idempotency_set_db(
     request_hash: str | None,
     kind: str,
 ) -> None:
-    from sqlalchemy import select
-    from sqlalchemy.exc import IntegrityError
-    from db_models import SubmittedTransaction
-
     now = datetime.utcnow()
-    row = SubmittedTransaction(
-        idempotency_key=key,
-        tx_id=tx_id,
-        request_hash=request_hash,
-        kind=kind,
-        status="submitted",
-        created_at=now,
-        expires_at=now + _IDEMPOTENCY_TTL,
+    expires_at = now + _IDEMPOTENCY_TTL
+    res = await db.execute(
+        sqlite_insert(SubmittedTransaction)
+        .values(
+            idempotency_key=key,
+            tx_id=tx_id,
+            request_hash=request_hash,
+            kind=kind,
+            status="submitted",
+            created_at=now,
+            expires_at=expires_at,
+        )
+        .on_conflict_do_nothing(index_elements=["idempotency_key"])
+        .returning(SubmittedTransaction.tx_id)
     )
-    db.add(row)
-    try:
-        await db.flush()
-    except IntegrityError:
+    if res.scalar_one_or_none() is None:
         # Race: another request stored it first. Keep the first tx_id.
         existing = await db.execute(
-            select(SubmittedTransaction).where(SubmittedTransaction.idempotency_key == key)
+            select(SubmittedTransaction.tx_id, SubmittedTransaction.expires_at)
+            .where(SubmittedTransaction.idempotency_key == key)
         )
-        existing_row = existing.scalar_one_or_none()
-        if existing_row:
-            return
-        raise
+        existing_row = existing.one()
+        _idempotency_cache_put(
+            key, existing_row.tx_id, (existing_row.expires_at - now).total_seconds()
+        )
+        return
+    _idempotency_cache_put(key, tx_id, _IDEMPOTENCY_TTL.total_seconds())
 
 
 def fix_base64_padding(b64_str: str) -> str:
     """Ensure proper base64 padding (must be multiple of 4)."""
-    padding_needed = len(b64_str) % 4
-    if padding_needed:
-        b64_str += '=' * (4 - padding_needed)
-    return b64_str
+    return b64_str + "=" * (-len(b64_str) & 3)
 
 
 def validate_base64(b64_str: str) -> bytes:
     """Validate and decode a base64 string. Returns raw bytes."""
-    padded = fix_base64_padding(b64_str)
+    # A length of 4n+1 can't be fixed by padding; reject before decoding
+    if len(b64_str) & 3 == 1:
+        raise ValueError("Invalid base64 encoding: impossible length")
     try:
-        decoded = base64.b64decode(padded)
-        return decoded
-    except Exception as e:
-        raise ValueError(f"Invalid base64 encoding: {e}")
+        # validate=True rejects non-alphabet characters in C instead of
+        # silently skipping them
+        return base64.b64decode(fix_base64_padding(b64_str), validate=True)
+    except binascii.Error as e:
+        raise ValueError(f"Invalid base64 encoding: {e}") from e
+
+
+def _send_raw_bytes(txn_bytes: bytes | bytearray) -> str:
+    """
+    POST already-decoded signed txn bytes to algod.
+
+    send_raw_transaction() takes base64 and decodes it again, so handing
+    it our validated bytes would cost an extra encode + decode per submit.
+    """
+    resp = algorand_client.client.algod_request(
+        "POST",
+        "/transactions",
+        data=txn_bytes,
+        headers={"Content-Type": "application/x-binary"},
+    )
+    return resp["txId"]
 
 
 async def submit_single(db, signed_txn_b64: str, *, idempotency_key: str | None = None) -> str:
@@ -112,30 +183,27 @@ async def submit_single(db, signed_txn_b64: str, *, idempotency_key: str | None
     Returns:
         Transaction ID from the network
     """
-    if idempotency_key:
-        cached = await _idempotency_get_db(db, key=idempotency_key)
-        if cached:
-            return cached
-
-    b64_str = fix_base64_padding(signed_txn_b64)
-
-    # Validate
-    decoded = validate_base64(b64_str)
-    request_hash = _sha256_hex(decoded)
-    logger.info(f"Submitting single txn: {len(decoded)} bytes")
-
-    # send_raw_transaction expects base64 string (it decodes internally)
-    tx_id = algorand_client.client.send_raw_transaction(b64_str)
-    logger.info(f"Transaction submitted: {tx_id}")
-    if idempotency_key:
-        await _idempotency_set_db(
-            db,
-            key=idempotency_key,
-            tx_id=tx_id,
-            request_hash=request_hash,
-            kind="single",
-        )
-    return tx_id
+    async with _idempotency_guard(idempotency_key):
+        if idempotency_key:
+            cached = await _idempotency_get_db(db, key=idempotency_key)
+            if cached:
+                return cached
+
+        # Validate
+        decoded = validate_base64(signed_txn_b64)
+        logger.info("Submitting single txn: %d bytes", len(decoded))
+
+        tx_id = await run_blocking(_send_raw_bytes, decoded)
+        logger.info("Transaction submitted: %s", tx_id)
+        if idempotency_key:
+            await _idempotency_set_db(
+                db,
+                key=idempotency_key,
+                tx_id=tx_id,
+                request_hash=_request_hash(decoded),
+                kind="single",
+            )
+        return tx_id
 
 
 async def submit_group(db, signed_txns_b64: list[str], *, idempotency_key: str | None = None) -> str:
@@ -148,35 +216,49 @@ async def submit_group(db, signed_txns_b64: list[str], *, idempotency_key: str |
     Returns:
         First transaction ID from the group
     """
-    if idempotency_key:
-        cached = await _idempotency_get_db(db, key=idempotency_key)
-        if cached:
-            return cached
-
-    logger.info(f"Submitting transaction group ({len(signed_txns_b64)} txns)")
-
-    # Decode and concatenate all signed transaction bytes
-    all_bytes = []
-    for i, txn_b64 in enumerate(signed_txns_b64):
-        txn_bytes = validate_base64(txn_b64)
-        all_bytes.append(txn_bytes)
-        logger.info(f"  Txn {i}: {len(txn_bytes)} bytes")
-
-    combined = b''.join(all_bytes)
-    combined_b64 = base64.b64encode(combined).decode()
-    request_hash = _sha256_hex(combined)
-
-    tx_id = algorand_client.client.send_raw_transaction(combined_b64)
-    logger.info(f"Group submitted: {tx_id}")
-    if idempotency_key:
-        await _idempotency_set_db(
-            db,
-            key=idempotency_key,
-            tx_id=tx_id,
-            request_hash=request_hash,
-            kind="group",
-        )
-    return tx_id
+    async with _idempotency_guard(idempotency_key):
+        if idempotency_key:
+            cached = await _idempotency_get_db(db, key=idempotency_key)
+            if cached:
+                return cached
+
+        logger.info("Submitting transaction group (%d txns)", len(signed_txns_b64))
+
+        # Decode each signed transaction straight onto one growing buffer;
+        # algod takes the bytearray as the request body, so no final copy
+        combined = bytearray()
+        for i, txn_b64 in enumerate(signed_txns_b64):
+            txn_bytes = validate_base64(txn_b64)
+            combined += txn_bytes
+            logger.info("  Txn %d: %d bytes", i, len(txn_bytes))
+
+        tx_id = await run_blocking(_send_raw_bytes, combined)
+        logger.info("Group submitted: %s", tx_id)
+        if idempotency_key:
+            await _idempotency_set_db(
+                db,
+                key=idempotency_key,
+                tx_id=tx_id,
+                request_hash=_request_hash(combined),
+                kind="group",
+            )
+        return tx_id
+
+
+# Checked in order; first match wins
+_ERROR_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE | re.DOTALL), code, detail)
+    for pattern, code, detail in (
+        (r"insufficient balance|below min", 400, "Insufficient balance for this transaction"),
+        (r"invalid signature", 400, "Invalid transaction signature"),
+        (r"already in ledger", 409, "Transaction already submitted"),
+        (
+            r"transaction pool.*full|full.*transaction pool",
+            503,
+            "Network busy — transaction pool full. Try again shortly.",
+        ),
+    )
+]
 
 
 def classify_error(error_msg: str) -> tuple[int, str]:
@@ -186,15 +268,7 @@ def classify_error(error_msg: str) -> tuple[int, str]:
     Returns:
         Tuple of (status_code, detail_message)
     """
-    lower = error_msg.lower()
-
-    if "insufficient balance" in lower or "below min" in lower:
-        return 400, "Insufficient balance for this transaction"
-    elif "invalid signature" in lower:
-        return 400, "Invalid transaction signature"
-    elif "already in ledger" in lower:
-        return 409, "Transaction already submitted"
-    elif "transaction pool" in lower and "full" in lower:
-        return 503, "Network busy — transaction pool full. Try again shortly."
-    else:
-        return 500, f"Transaction submission failed: {error_msg}"
+    for pattern, code, detail in _ERROR_PATTERNS:
+        if pattern.search(error_msg):
+            return code, detail
+    return 500, f"Transaction submission failed: {error_msg}"
@@ -9,7 +9,7 @@ Handles:
 
 Security fixes:
     - C3: verify_webhook_signature() now FAILS CLOSED when secret is missing
-    - M6: Uses Decimal for all fee/tip calculations
+    - M6: Fee/tip split in integer micro-ALGO (amount rounded to the nearest micro-ALGO once)
     - H4: Uses settings.platform_private_key (cached)
     - I1: Uses singleton algorand_client instead of creating a duplicate
 """
@@ -17,17 +17,19 @@ import hashlib
 import hmac
 import json
 import logging
+import time
 import uuid
 from datetime import datetime
-from decimal import Decimal, ROUND_DOWN
 from typing import Optional
 
-from algosdk import transaction, logic
+from algosdk import transaction
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from algorand_client import algorand_client as algo_client_singleton
 from config import settings
+from services.async_executor import run_blocking
+from sticker_scripts.utils import get_cached_params
 
 logger = logging.getLogger(__name__)
 
@@ -119,6 +121,20 @@ async def create_order(
 # ════════════════════════════════════════════════════════════════════
 
 
+# HMAC keyed with the Transak secret, built once: hmac.new() hashes the key
+# into its inner/outer pad states, and .copy() clones those states per
+# webhook. Rebuilt if settings.transak_secret changes.
+_webhook_hmac: Optional[tuple[str, hmac.HMAC]] = None
+
+
+def _webhook_hmac_for(secret: str) -> hmac.HMAC:
+    """Fresh HMAC-SHA256 for `secret`, cloned from the keyed template."""
+    global _webhook_hmac
+    if _webhook_hmac is None or _webhook_hmac[0] != secret:
+        _webhook_hmac = (secret, hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256))
+    return _webhook_hmac[1].copy()
+
+
 def verify_webhook_signature(payload: bytes, signature: str) -> bool:
     """
     Verify Transak webhook HMAC-SHA256 signature.
@@ -139,19 +155,41 @@ def verify_webhook_signature(payload: bytes, signature: str) -> bool:
         logger.warning("Webhook received without signature header")
         return False
 
-    expected = hmac.new(
-        settings.transak_secret.encode("utf-8"),
-        payload,
-        hashlib.sha256,
-    ).hexdigest()
+    try:
+        received = bytes.fromhex(signature)
+    except ValueError:
+        return False  # not hex, can't be our signature
 
-    return hmac.compare_digest(expected, signature)
+    mac = _webhook_hmac_for(settings.transak_secret)
+    mac.update(payload)
+    return hmac.compare_digest(mac.digest(), received)
 
 
 # ════════════════════════════════════════════════════════════════════
 # Webhook Processing
 # ════════════════════════════════════════════════════════════════════
 
+# Platform fee in basis points, fixed at startup (2.0% -> 200)
+_PLATFORM_FEE_BP = round(settings.platform_fee_percent * 100)
+
+
+def _to_micro(algo_amount) -> int:
+    """ALGO amount (number or numeric string) -> nearest micro-ALGO."""
+    # A double holds any 6-decimal ALGO amount to well under half a micro,
+    # so rounding recovers the exact on-chain integer
+    return round(float(algo_amount) * 1_000_000)
+
+
+def _split_tip(amount_micro: int, fee_bp: int) -> tuple[int, int]:
+    """
+    Split a received amount into (platform_fee_micro, tip_micro).
+
+    The fee rounds down; the remainder goes to the tip, so the two always
+    sum to amount_micro.
+    """
+    fee_micro = amount_micro * fee_bp // 10_000
+    return fee_micro, amount_micro - fee_micro
+
 
 async def process_webhook(data: dict, db: AsyncSession) -> dict:
     """
@@ -209,15 +247,12 @@ async def process_webhook(data: dict, db: AsyncSession) -> dict:
         order.transak_fee = data.get("totalFeeInFiat", 0)
         order.network_fee = data.get("networkFee", 0)
 
-        # Security fix M6: Use Decimal for financial calculations
-        # to avoid floating-point precision errors
-        crypto_decimal = Decimal(str(crypto_amount))
-        fee_percent_decimal = Decimal(str(settings.platform_fee_percent)) / Decimal("100")
-        platform_fee = crypto_decimal * fee_percent_decimal
-        tip_amount = crypto_decimal - platform_fee
+        # Security fix M6: the received amount is rounded once to the
+        # nearest micro-ALGO; the fee/tip split is then exact integer math
+        fee_micro, tip_micro = _split_tip(_to_micro(crypto_amount), _PLATFORM_FEE_BP)
 
-        order.platform_fee_algo = float(platform_fee.quantize(Decimal("0.000001"), rounding=ROUND_DOWN))
-        order.tip_amount_algo = float(tip_amount.quantize(Decimal("0.000001"), rounding=ROUND_DOWN))
+        order.platform_fee_algo = fee_micro / 1_000_000
+        order.tip_amount_algo = tip_micro / 1_000_000
 
         await db.flush()
 
@@ -226,8 +261,8 @@ async def process_webhook(data: dict, db: AsyncSession) -> dict:
             tx_id = await _route_tip_onchain(
                 creator_wallet=order.creator_wallet,
                 fan_wallet=order.fan_wallet,
-                algo_amount=float(tip_amount),
-                memo=f"tip_via_upi_{partner_order_id[-12:]}",
+                amount_micro=tip_micro,
+                memo=_build_tip_memo(order.partner_order_id),
             )
             order.tip_tx_id = tx_id
             order.tip_sent_at = datetime.utcnow()
@@ -235,15 +270,15 @@ async def process_webhook(data: dict, db: AsyncSession) -> dict:
             await db.commit()
 
             logger.info(
-                f"  ✅ Tip routed on-chain: {tip_amount:.6f} ALGO "
+                f"  ✅ Tip routed on-chain: {tip_micro / 1_000_000:.6f} ALGO "
                 f"→ {order.creator_wallet[:8]}... (tx: {tx_id[:20]}...)"
             )
 
             return {
                 "status": "tip_sent",
                 "tipTxId": tx_id,
-                "algoAmount": float(tip_amount),
-                "platformFee": float(platform_fee.quantize(Decimal("0.000001"), rounding=ROUND_DOWN)),
+                "algoAmount": tip_micro / 1_000_000,
+                "platformFee": fee_micro / 1_000_000,
             }
 
         except Exception as e:
@@ -268,48 +303,72 @@ async def process_webhook(data: dict, db: AsyncSession) -> dict:
 # ════════════════════════════════════════════════════════════════════
 
 
-async def _route_tip_onchain(
-    creator_wallet: str,
-    fan_wallet: str,
-    algo_amount: float,
-    memo: str = "",
-) -> str:
-    """
-    Route a tip through TipProxy on Algorand.
+# creator_wallet -> (app_id, app_address, monotonic expiry) of the active
+# TipProxy. Contracts only change on deploy/upgrade, which call
+# invalidate_tip_proxy(); the TTL bounds staleness from other processes.
+_TIP_PROXY_TTL_SECONDS = 300.0
+_tip_proxy_cache: dict[str, tuple[int, str, float]] = {}
 
-    Uses the platform wallet to:
-    1. Pay ALGO to the TipProxy contract app address
-    2. Call the TipProxy.tip() method with creator as account arg
 
-    The listener will detect this on-chain tip and mint the
-    appropriate NFT sticker for the fan.
+def invalidate_tip_proxy(creator_wallet: str) -> None:
+    """Forget the cached TipProxy for a creator (call after it changes)."""
+    _tip_proxy_cache.pop(creator_wallet, None)
 
-    Returns:
-        Algorand transaction ID
-    """
+
+async def _get_tip_proxy(creator_wallet: str) -> tuple[int, str]:
+    """Return (app_id, app_address) of the creator's active TipProxy."""
     from db_models import Contract
     from database import async_session
 
-    # Get the creator's TipProxy app_id
+    cached = _tip_proxy_cache.get(creator_wallet)
+    if cached and time.monotonic() < cached[2]:
+        return cached[0], cached[1]
+
     async with async_session() as db:
         result = await db.execute(
-            select(Contract).where(
+            select(Contract.app_id, Contract.app_address).where(
                 Contract.creator_wallet == creator_wallet,
                 Contract.active == True,
             )
         )
-        contract = result.scalar_one_or_none()
+        row = result.one_or_none()
 
-    if not contract:
+    if not row:
         raise ValueError(f"No active TipProxy for creator {creator_wallet[:8]}...")
 
-    app_id = contract.app_id
-    app_address = logic.get_application_address(app_id)
+    _tip_proxy_cache[creator_wallet] = (
+        row.app_id, row.app_address, time.monotonic() + _TIP_PROXY_TTL_SECONDS
+    )
+    return row.app_id, row.app_address
+
+
+# TipProxy.tip() app args: method selector + memo (constant prefix bytes)
+_TIP_ARG = b"tip"
+_MEMO_PREFIX = b"tip_via_upi_"
+
+
+def _build_tip_memo(partner_order_id: str) -> bytes:
+    """Tip memo for an order: prefix + last 12 chars of our (ASCII) order ID."""
+    return _MEMO_PREFIX + partner_order_id[-12:].encode("ascii")
+
+
+def _send_tip_group(
+    app_id: int,
+    app_address: str,
+    creator_wallet: str,
+    amount_micro: int,
+    memo: bytes,
+) -> str:
+    """
+    Build, sign, submit and confirm the Payment + TipProxy.tip() group.
+
+    Blocking; TipProxy asserts a group size of exactly 2, so each tip is
+    its own group.
+    """
     platform_key = _get_platform_key()
-    amount_micro = int(algo_amount * 1_000_000)
 
     # Build atomic group: Payment + AppCall
-    sp = _algod_client.suggested_params()
+    sp = get_cached_params(_algod_client)
     sp.fee = 2000  # Cover inner txn fee
     sp.flat_fee = True
 
@@ -325,7 +384,7 @@ async def _route_tip_onchain(
         sp=sp,
         index=app_id,
         on_complete=transaction.OnComplete.NoOpOC,
-        app_args=[b"tip", memo.encode("utf-8")],
+        app_args=[_TIP_ARG, memo],
         accounts=[creator_wallet],
     )
 
@@ -340,9 +399,38 @@ async def _route_tip_onchain(
     # Submit
     tx_id = _algod_client.send_transactions([signed_pay, signed_app])
     transaction.wait_for_confirmation(_algod_client, tx_id, 4)
+    return tx_id
+
+
+async def _route_tip_onchain(
+    creator_wallet: str,
+    fan_wallet: str,
+    amount_micro: int,
+    memo: bytes = b"",
+) -> str:
+    """
+    Route a tip through TipProxy on Algorand.
+
+    Uses the platform wallet to:
+    1. Pay ALGO to the TipProxy contract app address
+    2. Call the TipProxy.tip() method with creator as account arg
+
+    The listener will detect this on-chain tip and mint the
+    appropriate NFT sticker for the fan.
+
+    Returns:
+        Algorand transaction ID
+    """
+    app_id, app_address = await _get_tip_proxy(creator_wallet)
+
+    # algod calls block for the 4-round confirmation; run them off the event
+    # loop so concurrent COMPLETED webhooks overlap their waits
+    tx_id = await run_blocking(
+        _send_tip_group, app_id, app_address, creator_wallet, amount_micro, memo
+    )
 
     logger.info(
-        f"  💸 On-chain tip sent: {algo_amount:.4f} ALGO "
+        f"  💸 On-chain tip sent: {amount_micro / 1_000_000:.4f} ALGO "
         f"(fan={fan_wallet[:8]}... → creator={creator_wallet[:8]}...) "
         f"tx={tx_id}"
     )
@@ -359,12 +447,24 @@ async def get_order_status(partner_order_id: str, db: AsyncSession) -> Optional[
     """Get the current status of a Transak order."""
     from db_models import TransakOrder
 
+    # Read-only: plain column rows, no ORM instance/identity-map bookkeeping
     result = await db.execute(
-        select(TransakOrder).where(
+        select(
+            TransakOrder.partner_order_id,
+            TransakOrder.status,
+            TransakOrder.fiat_amount,
+            TransakOrder.fiat_currency,
+            TransakOrder.crypto_amount,
+            TransakOrder.platform_fee_algo,
+            TransakOrder.tip_amount_algo,
+            TransakOrder.tip_tx_id,
+            TransakOrder.created_at,
+            TransakOrder.completed_at,
+        ).where(
             TransakOrder.partner_order_id == partner_order_id
         )
     )
-    order = result.scalar_one_or_none()
+    order = result.one_or_none()
 
     if not order:
         return None
@@ -378,8 +478,8 @@ async def get_order_status(partner_order_id: str, db: AsyncSession) -> Optional[
         "platformFee": order.platform_fee_algo,
         "tipAmount": order.tip_amount_algo,
         "tipTxId": order.tip_tx_id,
-        "createdAt": order.created_at.isoformat() if order.created_at else None,
-        "completedAt": order.completed_at.isoformat() if order.completed_at else None,
+        "createdAt": order.created_at,
+        "completedAt": order.completed_at,
     }
 
 
@@ -388,12 +488,20 @@ async def get_fan_orders(fan_wallet: str, db: AsyncSession) -> list:
     from db_models import TransakOrder
 
     result = await db.execute(
-        select(TransakOrder)
+        select(
+            TransakOrder.partner_order_id,
+            TransakOrder.status,
+            TransakOrder.fiat_amount,
+            TransakOrder.fiat_currency,
+            TransakOrder.crypto_amount,
+            TransakOrder.tip_amount_algo,
+            TransakOrder.created_at,
+        )
         .where(TransakOrder.fan_wallet == fan_wallet)
         .order_by(TransakOrder.created_at.desc())
         .limit(20)
     )
-    orders = result.scalars().all()
+    orders = result.all()
 
     return [
         {
@@ -403,7 +511,7 @@ async def get_fan_orders(fan_wallet: str, db: AsyncSession) -> list:
             "fiatCurrency": o.fiat_currency,
             "cryptoAmount": o.crypto_amount,
             "tipAmount": o.tip_amount_algo,
-            "createdAt": o.created_at.isoformat() if o.created_at else None,
+            "createdAt": o.created_at,
         }
         for o in orders
     ]
@@ -9,6 +9,8 @@ import logging
 
 from algosdk.transaction import AssetConfigTxn, wait_for_confirmation
 
+from sticker_scripts.utils import get_cached_params
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,7 +38,7 @@ def mint_soulbound(
     Returns:
         int: Created asset ID.
     """
-    params = client.suggested_params()
+    params = get_cached_params(client)
     params.fee = max(params.fee, 1000)
     params.flat_fee = True
 
@@ -8,6 +8,8 @@ import logging
 
 from algosdk.transaction import AssetTransferTxn, wait_for_confirmation
 
+from sticker_scripts.utils import get_cached_params
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,7 +35,7 @@ def transfer_nft(
     Returns:
         str: Transaction ID.
     """
-    params = client.suggested_params()
+    params = get_cached_params(client)
     params.fee = max(params.fee, 1000)
     params.flat_fee = True
 
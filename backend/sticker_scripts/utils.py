@@ -4,12 +4,21 @@ Utility helpers for sticker scripts.
 Provides account derivation from mnemonic, replacing the old LocalNet-only
 utils that relied on KMD.
 """
+import copy
 import logging
+import time
+import weakref
+from functools import lru_cache
 
 from algosdk import mnemonic, account
 
 logger = logging.getLogger(__name__)
 
+# Suggested params change at most once per round (~3.3s); reuse them that
+# long per client instead of a GET /v2/transactions/params per transaction
+_PARAMS_TTL_SECONDS = 3.0
+_params_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
 
 def get_account_from_mnemonic(mnemonic_phrase: str) -> dict:
     """
@@ -21,7 +30,34 @@ def get_account_from_mnemonic(mnemonic_phrase: str) -> dict:
     Returns:
         dict with 'address' and 'private_key'.
     """
+    address, private_key = _derive_account(mnemonic_phrase)
+    return {"address": address, "private_key": private_key}
+
+
+@lru_cache(maxsize=8)
+def _derive_account(mnemonic_phrase: str) -> tuple[str, str]:
+    """
+    (address, private_key) for a mnemonic, derived once per phrase.
+
+    Like settings.platform_private_key, the cached key stays in memory for
+    the process lifetime; callers already hold the mnemonic itself.
+    """
     private_key = mnemonic.to_private_key(mnemonic_phrase)
     address = account.address_from_private_key(private_key)
     logger.debug(f"Derived account: {address[:8]}...")
-    return {"address": address, "private_key": private_key}
+    return address, private_key
+
+
+def get_cached_params(client):
+    """
+    Return suggested params for `client`, fetched at most every few seconds.
+
+    Each call gets its own shallow copy, so callers can set fee/flat_fee
+    freely (the other fields are immutable ints/strings).
+    """
+    now = time.monotonic()
+    cached = _params_cache.get(client)
+    if cached is None or now - cached[1] > _PARAMS_TTL_SECONDS:
+        cached = (client.suggested_params(), now)
+        _params_cache[client] = cached
+    return copy.copy(cached[0])
@@ -82,6 +82,7 @@ def mock_algod_client():
     mock_client.compile.return_value = {"result": "base64_compiled_teal"}
     mock_client.send_transaction.return_value = "test_tx_id_123"
     mock_client.send_raw_transaction.return_value = "test_tx_id_123"
+    mock_client.algod_request.return_value = {"txId": "test_tx_id_123"}
     mock_client.application_info.return_value = {
         "params": {
             "global-state": [
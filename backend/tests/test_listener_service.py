@@ -0,0 +1,208 @@
+"""
+Unit tests for the transaction listener.
+
+Tests TipProxy log parsing and tip routing.
+"""
+import base64
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from algosdk import account, encoding
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from db_models import NFT, ShawtyToken, StickerTemplate, Transaction
+from services import listener_service, mint_worker
+from services.listener_service import parse_tip_log
+
+
+def _tip_txn(fan_pk: bytes, amount_micro: int, memo: bytes = b"") -> dict:
+    raw = fan_pk + amount_micro.to_bytes(8, "big") + memo
+    return {"id": "TX1", "logs": [base64.b64encode(raw).decode()]}
+
+
+def test_parse_tip_log():
+    """Log is split into raw fan key, amount and memo."""
+    _, fan_address = account.generate_account()
+    fan_pk = encoding.decode_address(fan_address)
+
+    parsed = parse_tip_log(_tip_txn(fan_pk, 5_000_000, b"MEMBERSHIP:BAUNI"))
+
+    assert parsed == {
+        "fan_pk": fan_pk,
+        "amount_micro": 5_000_000,
+        "memo": "MEMBERSHIP:BAUNI",
+    }
+    assert encoding.encode_address(parsed["fan_pk"]) == fan_address
+
+
+def test_parse_tip_log_rejects_non_tip_calls():
+    """Txns without a log, or with a log shorter than 40 bytes, are not tips."""
+    assert parse_tip_log({"id": "TX1"}) is None
+    assert parse_tip_log({"id": "TX1", "logs": []}) is None
+    assert parse_tip_log({"id": "TX1", "logs": [base64.b64encode(b"x" * 39).decode()]}) is None
+
+
+# ── route_tip ────────────────────────────────────────────────────────
+
+
+@pytest.fixture(autouse=True)
+def _clear_template_cache():
+    listener_service._template_cache.clear()
+    yield
+    listener_service._template_cache.clear()
+
+
+def _tip_record(creator_wallet: str, fan_wallet: str, amount_micro: int, memo: str) -> Transaction:
+    return Transaction(
+        tx_id=f"TX_{memo or 'TIP'}_{amount_micro}",
+        fan_wallet=fan_wallet,
+        creator_wallet=creator_wallet,
+        app_id=1,
+        amount_micro=amount_micro,
+        memo=memo,
+        processed=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_route_tip_shawty_purchase(db_session, sample_creator_wallet, sample_fan_wallet):
+    """PURCHASE:SHAWTY mints a golden collectible and registers the token."""
+    db_session.add(StickerTemplate(
+        creator_wallet=sample_creator_wallet,
+        name="Shawty",
+        metadata_url="ipfs://QmShawty",
+        sticker_type="golden",
+        category="shawty_collectible",
+    ))
+    await db_session.commit()
+
+    tx = _tip_record(sample_creator_wallet, sample_fan_wallet, 2_000_000, "PURCHASE:SHAWTY")
+    mint = AsyncMock(return_value=5001)
+    send = AsyncMock(return_value={"status": "delivered", "tx_id": "XFER1"})
+    with patch("services.nft_service.mint_golden_sticker_async", mint), \
+         patch("services.nft_service.send_new_nft_to_fan_async", send):
+        await listener_service.route_tip(tx, db_session)
+    await db_session.commit()
+
+    token = (await db_session.execute(
+        select(ShawtyToken).where(ShawtyToken.purchase_tx_id == tx.tx_id)
+    )).scalar_one()
+    assert token.asset_id == 5001
+    assert token.owner_wallet == sample_fan_wallet
+
+    nft = (await db_session.execute(select(NFT).where(NFT.asset_id == 5001))).scalar_one()
+    assert nft.nft_class == "shawty"
+    assert nft.delivery_status == "delivered"
+    mint.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_route_tip_shawty_without_template(db_session, sample_creator_wallet, sample_fan_wallet):
+    """No template for the creator: nothing is minted."""
+    tx = _tip_record(sample_creator_wallet, sample_fan_wallet, 2_000_000, "PURCHASE:SHAWTY")
+    mint = AsyncMock(return_value=5002)
+    with patch("services.nft_service.mint_golden_sticker_async", mint):
+        await listener_service.route_tip(tx, db_session)
+
+    mint.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_preload_templates_caches_hits_and_misses(db_session, sample_creator_wallet):
+    """One preload caches found templates and remembers missing categories."""
+    db_session.add(StickerTemplate(
+        creator_wallet=sample_creator_wallet,
+        name="Bauni",
+        metadata_url="ipfs://QmBauni",
+        sticker_type="soulbound",
+        category="bauni_membership",
+    ))
+    await db_session.commit()
+
+    await listener_service._preload_templates(db_session, {sample_creator_wallet})
+
+    cache = listener_service._template_cache
+    assert cache[(sample_creator_wallet, "bauni_membership")].name == "Bauni"
+    assert cache[(sample_creator_wallet, "shawty_collectible")] is None
+    assert cache[(sample_creator_wallet, "butki_badge")] is None
+
+
+@pytest.mark.asyncio
+async def test_route_tip_new_nft_pending_without_algod_lookups(
+    db_session, sample_creator_wallet, sample_fan_wallet
+):
+    """A freshly minted NFT for a non-demo fan goes pending with no asset/account lookups."""
+    db_session.add(StickerTemplate(
+        creator_wallet=sample_creator_wallet,
+        name="Shawty",
+        metadata_url="ipfs://QmShawty",
+        sticker_type="golden",
+        category="shawty_collectible",
+    ))
+    await db_session.commit()
+
+    tx = _tip_record(sample_creator_wallet, sample_fan_wallet, 2_000_000, "PURCHASE:SHAWTY")
+    mint = AsyncMock(return_value=5003)
+    with patch("services.nft_service.mint_golden_sticker_async", mint), \
+         patch("services.nft_service.send_nft_to_fan") as lookup_send:
+        await listener_service.route_tip(tx, db_session)
+    await db_session.commit()
+
+    nft = (await db_session.execute(select(NFT).where(NFT.asset_id == 5003))).scalar_one()
+    assert nft.delivery_status == "pending_optin"
+    assert nft.tx_id is None
+    lookup_send.assert_not_called()
+
+
+# ── retry task ───────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_retry_batch_skips_tip_finished_by_worker(
+    db_session, sample_creator_wallet, sample_fan_wallet
+):
+    """A worker finishing a tip after the retry scan read it does not mint it twice."""
+    tx = _tip_record(sample_creator_wallet, sample_fan_wallet, 2_000_000, "PURCHASE:SHAWTY")
+    tx.detected_at = datetime.utcnow() - timedelta(hours=1)
+    db_session.add(tx)
+    await db_session.commit()
+    tx_id, row_id = tx.tx_id, tx.id
+
+    sessions = async_sessionmaker(db_session.bind, expire_on_commit=False)
+    route = AsyncMock()
+
+    async with sessions() as retry_db:
+        scan = retry_db.execute
+
+        async def scan_then_worker(*args, **kwargs):
+            # The worker completes the tip between the retry scan and its turn
+            result = await scan(*args, **kwargs)
+            if route.await_count == 0:
+                await mint_worker.mint_tip(tx_id)
+            return result
+
+        with patch.object(mint_worker, "async_session", sessions), \
+             patch.object(listener_service, "route_tip", route), \
+             patch.object(retry_db, "execute", scan_then_worker):
+            await listener_service._retry_batch(retry_db, 0)
+
+    route.assert_awaited_once()
+    db_session.expire_all()
+    assert (await db_session.get(Transaction, row_id)).processed is True
+
+
+@pytest.mark.asyncio
+async def test_retry_batch_leaves_fresh_tips_to_workers(
+    db_session, sample_creator_wallet, sample_fan_wallet
+):
+    """A never-retried tip inside the grace period is not picked up."""
+    db_session.add(_tip_record(sample_creator_wallet, sample_fan_wallet, 2_000_000, "PURCHASE:SHAWTY"))
+    await db_session.commit()
+
+    route = AsyncMock()
+    with patch.object(listener_service, "route_tip", route):
+        assert await listener_service._retry_batch(db_session, 0) is None
+
+    route.assert_not_awaited()
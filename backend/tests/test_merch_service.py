@@ -9,6 +9,13 @@ from services import merch_service
 from db_models import Product, DiscountRule, Order, OrderItem
 
 
+@pytest.fixture(autouse=True)
+def _clear_discount_rule_cache():
+    merch_service._no_unconditional_rules.clear()
+    yield
+    merch_service._no_unconditional_rules.clear()
+
+
 @pytest.mark.asyncio
 async def test_create_product(db_session, sample_creator_wallet):
     """Create a new product."""
@@ -102,6 +109,48 @@ async def test_build_quote_with_percent_discount(db_session, sample_creator_wall
     assert quote["total_algo"] == 90.0
 
 
+@pytest.mark.asyncio
+async def test_build_quote_picks_largest_discount(db_session, sample_creator_wallet, sample_fan_wallet):
+    """With several eligible rules, the one giving the biggest discount wins."""
+    product = await merch_service.create_product(
+        db_session,
+        creator_wallet=sample_creator_wallet,
+        slug="test-product",
+        name="Test",
+        description=None,
+        image_ipfs_hash=None,
+        price_algo=100.0,
+        stock_quantity=None,
+        active=True,
+    )
+    await db_session.commit()
+
+    rules = {}
+    for discount_type, value in (("PERCENT", 10.0), ("FIXED_ALGO", 15.0), ("PERCENT", 5.0)):
+        rule = await merch_service.create_discount_rule(
+            db_session,
+            creator_wallet=sample_creator_wallet,
+            product_id=None,
+            discount_type=discount_type,
+            value=value,
+            min_shawty_tokens=0,
+            requires_bauni=False,
+            max_uses_per_wallet=None,
+        )
+        rules[(discount_type, value)] = rule
+    await db_session.commit()
+
+    quote = await merch_service.build_quote(
+        db_session,
+        fan_wallet=sample_fan_wallet,
+        creator_wallet=sample_creator_wallet,
+        items=[{"product_id": product.id, "quantity": 1}],
+    )
+
+    assert quote["discount_algo"] == 15.0  # fixed 15 beats 10% of 100
+    assert quote["applied_discount_rule_id"] == rules[("FIXED_ALGO", 15.0)].id
+
+
 @pytest.mark.asyncio
 async def test_build_quote_with_shawty_discount(db_session, sample_creator_wallet, sample_fan_wallet):
     """Quote requiring Shawty tokens should validate ownership."""
@@ -275,3 +324,135 @@ async def test_settle_order_payment(db_session, sample_creator_wallet, sample_fa
     # Inventory should be reduced
     await db_session.refresh(product)
     assert product.stock_quantity == 95  # 100 - 5
+
+
+@pytest.mark.asyncio
+async def test_update_product_scoped_to_creator(db_session, sample_creator_wallet, sample_fan_wallet):
+    """Update applies only provided fields, and only for the owning creator."""
+    from domain.errors import NotFoundError
+
+    product = await merch_service.create_product(
+        db_session,
+        creator_wallet=sample_creator_wallet,
+        slug="test-product",
+        name="Test",
+        description="Keep me",
+        image_ipfs_hash=None,
+        price_algo=10.0,
+        stock_quantity=None,
+        active=True,
+    )
+    await db_session.commit()
+
+    updated = await merch_service.update_product(
+        db_session,
+        product_id=product.id,
+        creator_wallet=sample_creator_wallet,
+        price_algo=12.5,
+    )
+    await db_session.commit()
+
+    assert updated.price_algo == 12.5
+    assert updated.description == "Keep me"
+
+    with pytest.raises(NotFoundError):
+        await merch_service.update_product(
+            db_session,
+            product_id=product.id,
+            creator_wallet=sample_fan_wallet,
+            price_algo=1.0,
+        )
+
+
+@pytest.mark.asyncio
+async def test_soft_delete_product_blocked_by_pending_order(db_session, sample_creator_wallet, sample_fan_wallet):
+    """A product with a pending order can't be deleted; once paid, it can."""
+    from domain.errors import ConflictError
+
+    product = await merch_service.create_product(
+        db_session,
+        creator_wallet=sample_creator_wallet,
+        slug="test-product",
+        name="Test",
+        description=None,
+        image_ipfs_hash=None,
+        price_algo=10.0,
+        stock_quantity=None,
+        active=True,
+    )
+    await db_session.commit()
+
+    quote = await merch_service.build_quote(
+        db_session,
+        fan_wallet=sample_fan_wallet,
+        creator_wallet=sample_creator_wallet,
+        items=[{"product_id": product.id, "quantity": 1}],
+    )
+    order = await merch_service.create_order(
+        db_session,
+        fan_wallet=sample_fan_wallet,
+        creator_wallet=sample_creator_wallet,
+        quote=quote,
+    )
+    await db_session.commit()
+
+    with pytest.raises(ConflictError):
+        await merch_service.soft_delete_product(
+            db_session, product_id=product.id, creator_wallet=sample_creator_wallet
+        )
+
+    await merch_service.settle_order_payment(
+        db_session,
+        order_id=order.id,
+        fan_wallet=sample_fan_wallet,
+        creator_wallet=sample_creator_wallet,
+        amount_algo=10.0,
+        tx_id="tx_delete_test",
+    )
+    await db_session.commit()
+
+    deleted = await merch_service.soft_delete_product(
+        db_session, product_id=product.id, creator_wallet=sample_creator_wallet
+    )
+    assert deleted.active is False
+
+
+@pytest.mark.asyncio
+async def test_build_quote_sees_rule_created_after_empty_quote(db_session, sample_creator_wallet, sample_fan_wallet):
+    """A plain quote with no rules must not hide a rule created right after it."""
+    product = await merch_service.create_product(
+        db_session,
+        creator_wallet=sample_creator_wallet,
+        slug="test-product",
+        name="Test",
+        description=None,
+        image_ipfs_hash=None,
+        price_algo=100.0,
+        stock_quantity=None,
+        active=True,
+    )
+    await db_session.commit()
+    items = [{"product_id": product.id, "quantity": 1}]
+
+    quote = await merch_service.build_quote(
+        db_session, fan_wallet=sample_fan_wallet, creator_wallet=sample_creator_wallet, items=items
+    )
+    assert quote["discount_algo"] == 0.0
+
+    await merch_service.create_discount_rule(
+        db_session,
+        creator_wallet=sample_creator_wallet,
+        product_id=None,
+        discount_type="PERCENT",
+        value=20.0,
+        min_shawty_tokens=0,
+        requires_bauni=False,
+        max_uses_per_wallet=None,
+    )
+    await db_session.commit()
+    merch_service.invalidate_discount_rules(sample_creator_wallet)
+
+    quote = await merch_service.build_quote(
+        db_session, fan_wallet=sample_fan_wallet, creator_wallet=sample_creator_wallet, items=items
+    )
+    assert quote["discount_algo"] == 20.0
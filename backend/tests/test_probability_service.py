@@ -0,0 +1,25 @@
+"""
+Unit tests for the golden sticker probability engine.
+"""
+import pytest
+
+from config import settings
+from services import probability_service
+
+
+@pytest.mark.parametrize("interval", [8, 10])
+def test_guaranteed_golden_every_interval(monkeypatch, interval):
+    """Every Nth tip is golden for power-of-two and other intervals alike."""
+    monkeypatch.setattr(settings, "golden_trigger_interval", interval)
+
+    for n in (1, 2, 3):
+        assert probability_service.should_mint_golden(interval * n, override_probability=0.0)
+    for tip_count in (0, 1, interval - 1, interval + 1):
+        assert not probability_service.should_mint_golden(tip_count, override_probability=0.0)
+
+
+def test_trigger_interval_zero_disables_guarantee(monkeypatch):
+    """An interval of 0 turns the guaranteed path off."""
+    monkeypatch.setattr(settings, "golden_trigger_interval", 0)
+
+    assert not probability_service.should_mint_golden(10, override_probability=0.0)
@@ -191,3 +191,79 @@ async def test_burn_and_lock_mutually_exclusive(db_session, sample_creator_walle
 
     # Attempting to burn a locked token should be prevented by business logic
     # (implementation may vary, but they should be mutually exclusive)
+
+
+@pytest.mark.asyncio
+async def test_validate_ownership_many(db_session, sample_creator_wallet, sample_fan_wallet):
+    """Batch validation reports each asset like validate_ownership."""
+    other_fan = "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA"
+    for asset_id, owner in ((2001, sample_fan_wallet), (2002, other_fan)):
+        await shawty_service.register_purchase(
+            db_session,
+            asset_id=asset_id,
+            owner_wallet=owner,
+            creator_wallet=sample_creator_wallet,
+            purchase_tx_id=f"tx_many_{asset_id}",
+            amount_paid_micro=2_000_000,
+        )
+    await db_session.commit()
+
+    result = await shawty_service.validate_ownership_many(
+        db_session, [2001, 2002, 2003], sample_fan_wallet
+    )
+
+    assert result[2001]["is_valid"] is True
+    assert result[2002]["is_valid"] is False
+    assert result[2003]["token"] is None
+
+
+@pytest.mark.asyncio
+async def test_lock_many_for_discount(db_session, sample_creator_wallet, sample_fan_wallet):
+    """Batch lock locks every valid token; a repeated id fails as already locked."""
+    tokens = []
+    for asset_id in (2001, 2002):
+        tokens.append(await shawty_service.register_purchase(
+            db_session,
+            asset_id=asset_id,
+            owner_wallet=sample_fan_wallet,
+            creator_wallet=sample_creator_wallet,
+            purchase_tx_id=f"tx_lock_many_{asset_id}",
+            amount_paid_micro=2_000_000,
+        ))
+    await db_session.commit()
+
+    results = await shawty_service.lock_many_for_discount(
+        db_session, [2001, 2002, 2001], sample_fan_wallet, "Order discount"
+    )
+    await db_session.commit()
+
+    assert [r["success"] for r in results] == [True, True, False]
+    for token in tokens:
+        await db_session.refresh(token)
+        assert token.is_locked is True
+
+
+@pytest.mark.asyncio
+async def test_burn_many_for_merch(db_session, sample_creator_wallet, sample_fan_wallet):
+    """Batch burn burns every valid token; unknown ids fail without aborting the rest."""
+    tokens = []
+    for asset_id in (2001, 2002):
+        tokens.append(await shawty_service.register_purchase(
+            db_session,
+            asset_id=asset_id,
+            owner_wallet=sample_fan_wallet,
+            creator_wallet=sample_creator_wallet,
+            purchase_tx_id=f"tx_burn_many_{asset_id}",
+            amount_paid_micro=2_000_000,
+        ))
+    await db_session.commit()
+
+    results = await shawty_service.burn_many_for_merch(
+        db_session, [2001, 9999, 2002], sample_fan_wallet, "Hoodie M"
+    )
+    await db_session.commit()
+
+    assert [r["success"] for r in results] == [True, False, True]
+    for token in tokens:
+        await db_session.refresh(token)
+        assert token.is_burned is True
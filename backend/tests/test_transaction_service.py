@@ -0,0 +1,99 @@
+"""
+Unit tests for transaction submission and idempotency handling.
+"""
+import asyncio
+import base64
+
+import pytest
+
+from services import transaction_service
+
+
+@pytest.fixture(autouse=True)
+def _clear_idempotency_cache():
+    transaction_service._idempotency_cache.clear()
+    yield
+    transaction_service._idempotency_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_retries_submit_once(db_session, mock_algod_client):
+    """Concurrent submissions with one idempotency key hit algod once."""
+    signed = base64.b64encode(b"signed-txn-bytes").decode()
+
+    tx_ids = await asyncio.gather(*(
+        transaction_service.submit_single(db_session, signed, idempotency_key="retry-key")
+        for _ in range(3)
+    ))
+
+    assert tx_ids == ["test_tx_id_123"] * 3
+    assert mock_algod_client.algod_request.call_count == 1
+    assert transaction_service._idempotency_locks == {}
+
+
+@pytest.mark.asyncio
+async def test_idempotency_guard_has_one_holder_per_key():
+    """A caller arriving while a waiter is handed the lock still queues behind it."""
+    active = 0
+    peak = 0
+
+    async def submit():
+        nonlocal active, peak
+        async with transaction_service._idempotency_guard("handoff-key"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+
+    async def submit_twice():
+        await submit()
+        await submit()
+
+    await asyncio.gather(submit_twice(), submit())
+
+    assert peak == 1
+    assert transaction_service._idempotency_locks == {}
+
+
+@pytest.mark.asyncio
+async def test_idempotency_falls_back_to_db(db_session, mock_algod_client):
+    """A key stored by another process is still honoured after a cache miss."""
+    signed = base64.b64encode(b"signed-txn-bytes").decode()
+    await transaction_service.submit_single(db_session, signed, idempotency_key="db-key")
+    await db_session.commit()
+    transaction_service._idempotency_cache.clear()
+
+    tx_id = await transaction_service.submit_single(db_session, signed, idempotency_key="db-key")
+
+    assert tx_id == "test_tx_id_123"
+    assert mock_algod_client.algod_request.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_idempotency_set_keeps_first_tx_id(db_session):
+    """A losing concurrent insert leaves the stored tx_id and caches the winner."""
+    await transaction_service._idempotency_set_db(
+        db_session, key="race-key", tx_id="first_tx", request_hash=None, kind="single"
+    )
+    transaction_service._idempotency_cache.clear()
+
+    await transaction_service._idempotency_set_db(
+        db_session, key="race-key", tx_id="second_tx", request_hash=None, kind="single"
+    )
+
+    assert transaction_service._idempotency_cache["race-key"][0] == "first_tx"
+    transaction_service._idempotency_cache.clear()
+    assert await transaction_service._idempotency_get_db(db_session, key="race-key") == "first_tx"
+
+
+@pytest.mark.asyncio
+async def test_submit_group_posts_concatenated_txns(db_session, mock_algod_client):
+    """The group is posted to algod as one concatenated binary body."""
+    txns = [b"first-signed-txn", b"second"]
+
+    tx_id = await transaction_service.submit_group(
+        db_session, [base64.b64encode(t).decode() for t in txns]
+    )
+
+    assert tx_id == "test_tx_id_123"
+    assert mock_algod_client.algod_request.call_args.kwargs["data"] == b"".join(txns)